@@ -1,4 +1,15 @@
-def damerau_levenshtein_distance(s1: str, s2: str) -> int:
+from array import array
+
+from sequence_utils import candidate_windows, encode_pair, parallel_window_search
+
+# Compiled DP from _editdist.pyx, if it has been built
+try:
+    from _editdist import dlev as _dlev_compiled
+except ImportError:
+    _dlev_compiled = None
+
+
+def damerau_levenshtein_distance(s1: str, s2: str, max_k: int = None) -> int:
     """
     Computes Damerau–Levenshtein edit distance between two strings.
 
@@ -16,60 +27,236 @@ def damerau_levenshtein_distance(s1: str, s2: str) -> int:
         If s1[i-1] == s2[j-2] and s1[i-2] == s2[j-1]:
             dp[i][j] = min(dp[i][j], dp[i-2][j-2] + 1)
 
+    Only the three most recent DP rows are needed (row i-2 for the
+    transposition), so they are kept in typed arrays and rotated.
+
+    When max_k is given, only the diagonal band |i - j| <= max_k is
+    filled and the computation stops once a whole row exceeds max_k
+    (Ukkonen's cutoff).
+
     Parameters
     ----------
     s1 : str
         First string
     s2 : str
         Second string
+    max_k : int, optional
+        Only distances up to max_k are of interest. Anything larger is
+        reported as max_k + 1.
 
     Returns
     -------
     int
-        Minimum edit distance
+        Minimum edit distance (capped at max_k + 1 if max_k is given)
 
     Complexity
     ----------
-    Time:  O(len(s1) * len(s2))
-    Space: O(len(s1) * len(s2))
+    Time:  O(len(s1) * len(s2)), or O(len(s1) * max_k) with max_k
+    Space: O(len(s2))
+    """
+
+    # Encode once so character compares are int compares
+    b, a, sigma = encode_pair(s2, s1)
+    if _dlev_compiled is not None and not isinstance(b, array):
+        return _dlev_compiled(a, b, -1 if max_k is None else max_k)
+    return _damerau_range(a, b, 0, len(b), sigma, max_k)
+
+
+def _swap_keys(b, sigma):
+    """
+    Transposition keys of the encoded string b, one per position.
+
+    keys[p] packs the pair (b[p], b[p-1]) into one int, so the DP can
+    test a transposition with a single compare. The keys depend only on
+    the position in b, so a sliding-window caller builds them once for
+    the whole text. keys[0] is -1, which never matches.
+    """
+    return [-1] + [b[p]*sigma + b[p-1] for p in range(1, len(b))]
+
+
+def _damerau_rows(n, m, max_k=None):
+    """
+    Row buffers for _damerau_range and the templates that reset them.
+
+    Returns (band, rows, init): rows is the list [prev2, prev, curr] of
+    typed arrays, and init holds the base-case contents each row is
+    reset to before a DP. Sliding-window callers allocate them once and
+    reuse them for every window.
+    """
+    if max_k is None:
+        band = max(n, m)        # band covers the whole table
+    else:
+        band = max_k
+    cap = band + 1              # stands in for "more than band"
+
+    typecode = 'H' if max(n, m) < 0xFFFF else 'L'
+
+    # base cases: row 0 is 0..m, column 0 is set per row
+    caps = array(typecode, [cap]) * (m+1)
+    row0 = array(typecode, [min(j, cap) for j in range(m+1)])
+    init = (caps, row0, caps)
+    rows = [array(typecode, row) for row in init]
+    return band, rows, init
+
+
+def _damerau_range(a, b, off, m, sigma, max_k=None, keys=None, buffers=None):
+    """
+    damerau_levenshtein_distance of the encoded a against b[off:off+m].
+
+    The window is read in place from b, so sliding-window callers do
+    not allocate a slice (or re-encode the text) per window. They also
+    pass keys (from _swap_keys(b, sigma)) and buffers (from
+    _damerau_rows), which are otherwise built here per call.
     """
+    n = len(a)
+    base = off - 1              # b[base + j] is window character j
+
+    if max_k is not None and abs(n - m) > max_k:
+        return max_k + 1        # length difference alone exceeds k
 
-    n, m = len(s1), len(s2)
-    dp = [[0]*(m+1) for _ in range(n+1)]
+    if keys is None:
+        keys = _swap_keys(b, sigma)
+    if buffers is None:
+        buffers = _damerau_rows(n, m, max_k)
+    band, rows, init = buffers
+    cap = band + 1
 
-    # base cases
-    for i in range(n+1):
-        dp[i][0] = i
-    for j in range(m+1):
-        dp[0][j] = j
+    prev2, prev, curr = rows
+    prev2[:] = init[0]                                          # row i-2
+    prev[:] = init[1]                                           # row i-1
+    curr[:] = init[2]                                           # row i
 
     for i in range(1, n+1):
-        for j in range(1, m+1):
+        lo = max(1, i - band)
+        hi = min(m, i + band)
 
-            cost = 0 if s1[i-1] == s2[j-1] else 1
+        left = curr[lo-1] = i if lo == 1 else cap
+        diag = prev[lo-1]
+        ai = a[i-1]
+        # The pair (s1[i-2], s1[i-1]) packed like the keys of b
+        pair = a[i-2]*sigma + ai if i > 1 else -2
+
+        # dp[i][j-1] and dp[i-1][j-1] are carried in locals
+        for j in range(lo, hi+1):
+            up = prev[j]
+
+            cost = 0 if ai == b[base + j] else 1
 
             # substitution / insertion / deletion
-            dp[i][j] = min(
-                dp[i-1][j] + 1,      # deletion
-                dp[i][j-1] + 1,      # insertion
-                dp[i-1][j-1] + cost  # substitution / match
+            d = min(
+                up + 1,             # deletion
+                left + 1,           # insertion
+                diag + cost         # substitution / match
             )
 
-            # transposition
-            if i > 1 and j > 1 \
-               and s1[i-1] == s2[j-2] \
-               and s1[i-2] == s2[j-1]:
-                dp[i][j] = min(
-                    dp[i][j],
-                    dp[i-2][j-2] + 1
+            # transposition (column 1 has no pair inside the window)
+            if pair == keys[base + j] and j > 1:
+                d = min(
+                    d,
+                    prev2[j-2] + 1
                 )
 
-    return dp[n][m]
+            curr[j] = left = d
+            diag = up
+
+        # early exit: no later row can drop back below the row minimum
+        if max_k is not None and min(curr[lo-1:hi+1]) > max_k:
+            return cap
+
+        prev2, prev, curr = prev, curr, prev2
+
+    return min(prev[m], cap)
+
+
+def hyyro_approx(text: str, pattern: str, k: int) -> list:
+    """
+    Sliding-window Damerau-Levenshtein matching with Hyyrö's bit-vector
+    algorithm.
+
+    This is Myers' bit-parallel Levenshtein extended with a
+    transposition vector tr: bit j is set when pattern[j-1..j] equals
+    the last two window characters swapped and the previous column did
+    not already match diagonally there.
+
+    The results are identical to running damerau_levenshtein_distance
+    on every window text[i:i+m].
+
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+    k : int
+        Maximum allowed edit distance.
+
+    Returns
+    -------
+    list
+        Starting indices where pattern matches with ≤k edits.
+
+    Complexity
+    ----------
+    Time:  O(n * m) word operations instead of O(n * m^2) cells
+    Space: O(|Σ|)
+    """
+    txt, pat, sigma = encode_pair(text, pattern)
+    return _hyyro_scan(txt, pat, sigma, k, range(len(txt) - len(pat) + 1))
+
+
+def _hyyro_scan(txt, pat, sigma, k, starts):
+    """Run the bit-vector distance on the windows beginning at starts."""
+    n, m = len(txt), len(pat)
+
+    if m == 0:
+        return list(range(n + 1))
+
+    # peq[c] has bit j set when pattern[j] == c
+    peq = [0] * sigma
+    for j, c in enumerate(pat):
+        peq[c] |= 1 << j
+
+    full = (1 << m) - 1
+    top = 1 << (m - 1)
+
+    matches = []
+
+    for i in starts:
+        vp, vn, score = full, 0, m   # first column is 0, 1, ..., m
+        d0 = 0
+        eq_prev = 0
+
+        for c in txt[i:i+m]:
+            eq = peq[c]
+            tr = ((~d0 & eq) << 1) & eq_prev
+            d0 = (((eq & vp) + vp) ^ vp) | eq | vn | tr
+            hp = vn | ~(d0 | vp)
+            hn = vp & d0
+
+            if hp & top:
+                score += 1
+            elif hn & top:
+                score -= 1
+
+            hp = (hp << 1) | 1
+            hn <<= 1
+            vp = (hn | ~(d0 | hp)) & full
+            vn = hp & d0
+            eq_prev = eq
+
+        if score <= k:
+            matches.append(i)
+
+    return matches
 
 
 def find_approximate_matches(text: str, pattern: str, k: int) -> list:
     """
     Find all positions where pattern matches text with at most k edits.
+
+    Candidate windows are found with a pigeonhole filter that locates
+    exact pattern parts via bytes.find; only those windows are verified
+    with the bit-parallel scan of hyyro_approx.
     
     Parameters
     ----------
@@ -85,19 +272,83 @@ def find_approximate_matches(text: str, pattern: str, k: int) -> list:
     list
         Starting indices where pattern matches with ≤k edits.
     """
-    matches = []
-    m = len(pattern)
-    n = len(text)
+    txt, pat, sigma = encode_pair(text, pattern)
+
+    # Only verify windows that contain an exact pattern part nearby:
+    # each edit (a transposition can straddle two parts) spoils at
+    # most two of 2k+1 pattern parts
+    starts = candidate_windows(txt, pat, 2*k + 1, k)
+    return _hyyro_scan(txt, pat, sigma, k, starts)
+
+
+def find_approximate_matches_dp(text: str, pattern: str, k: int) -> list:
+    """
+    Sliding-window matching with the classic DP of damerau_levenshtein_distance.
+
+    Kept as the dynamic-programming baseline for benchmarks. Text and
+    pattern are encoded once, and every window is read in place from
+    the encoded text; the transposition keys and the DP rows are built
+    once per scan, so the loop allocates nothing per window.
     
-    for i in range(n - m + 1):
-        window = text[i:i+m]
-        distance = damerau_levenshtein_distance(pattern, window)
-        if distance <= k:
-            matches.append(i)
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+    k : int
+        Maximum allowed edit distance.
     
+    Returns
+    -------
+    list
+        Starting indices where pattern matches with ≤k edits.
+    """
+    txt, pat, sigma = encode_pair(text, pattern)
+    m = len(pat)
+
+    # Built once per scan and shared by every window
+    keys = _swap_keys(txt, sigma)
+    buffers = _damerau_rows(m, m, k)
+
+    matches = []
+    for i in range(len(txt) - m + 1):
+        if _damerau_range(pat, txt, i, m, sigma, k, keys, buffers) <= k:
+            matches.append(i)
     return matches
 
 
+def find_approximate_matches_parallel(text: str, pattern: str, k: int,
+                                      nproc: int = None) -> list:
+    """
+    Parallel version of find_approximate_matches.
+
+    The n-m+1 window comparisons are independent, so the window starts
+    are split into nproc contiguous blocks. Each block gets the text
+    slice it covers plus the m-1 characters of overlap needed by its
+    last window, and is matched in a separate process. Results are
+    shifted back by the block offset and concatenated in order (see
+    sequence_utils.parallel_window_search).
+
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+    k : int
+        Maximum allowed edit distance.
+    nproc : int, optional
+        Number of worker processes (default: os.cpu_count()).
+
+    Returns
+    -------
+    list
+        Starting indices where pattern matches with ≤k edits.
+    """
+    return parallel_window_search(find_approximate_matches, text, pattern, k, nproc)
+
+
 if __name__ == '__main__':
     print("Damerau-Levenshtein Approximate Matching")
     print("=" * 50)
@@ -1,4 +1,16 @@
-def levenshtein_distance(s1: str, s2: str) -> int:
+import functools
+from array import array
+
+from sequence_utils import candidate_windows, encode_pair, parallel_window_search
+
+# Compiled DP from _editdist.pyx, if it has been built
+try:
+    from _editdist import lev as _lev_compiled
+except ImportError:
+    _lev_compiled = None
+
+
+def levenshtein_distance(s1: str, s2: str, max_k: int = None) -> int:
     """
     Computes the Levenshtein edit distance between two strings.
 
@@ -10,55 +22,232 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     DP Relation (matches report):
         dp[i][j] = minimum edits to convert s1[0..i] → s2[0..j]
 
+    Only two rows of the DP table are kept alive: row i depends on
+    row i-1 alone, so the rows are stored in typed arrays and swapped
+    after every outer iteration.
+
+    When max_k is given, Ukkonen's cutoff is applied: only the diagonal
+    band |i - j| <= max_k is filled (cells outside it are > max_k
+    anyway), and the computation stops as soon as a whole row exceeds
+    max_k.
+
     Parameters
     ----------
     s1 : str
         First string.
     s2 : str
         Second string.
+    max_k : int, optional
+        Only distances up to max_k are of interest. Anything larger is
+        reported as max_k + 1.
 
     Returns
     -------
     int
-        Minimum edit distance.
+        Minimum edit distance (capped at max_k + 1 if max_k is given).
 
     Complexity
     ----------
-    Time:  O(len(s1) * len(s2))
-    Space: O(len(s1) * len(s2))
+    Time:  O(len(s1) * len(s2)), or O(len(s1) * max_k) with max_k
+    Space: O(len(s2))
+    """
+
+    # Encode once so character compares are int compares
+    b, a, _ = encode_pair(s2, s1)
+    if _lev_compiled is not None and not isinstance(b, array):
+        return _lev_compiled(a, b, -1 if max_k is None else max_k)
+    return _levenshtein_range(a, b, 0, len(b), max_k)
+
+
+def _levenshtein_range(a, b, off, m, max_k=None):
     """
+    levenshtein_distance of the encoded string a against b[off:off+m].
 
-    n, m = len(s1), len(s2)
+    The window is read in place from b, so sliding-window callers do
+    not allocate a slice (or re-encode the text) per window.
+    """
+    n = len(a)
+    base = off - 1              # b[base + j] is window character j
 
-    # Initialize DP matrix
-    dp = [[0]*(m+1) for _ in range(n+1)]
+    if max_k is None:
+        band = max(n, m)        # band covers the whole table
+    elif abs(n - m) > max_k:
+        return max_k + 1        # length difference alone exceeds k
+    else:
+        band = max_k
+    cap = band + 1              # stands in for "more than band"
 
-    # Base cases:
-    # converting to/from empty string
-    for i in range(n+1):
-        dp[i][0] = i
-    for j in range(m+1):
-        dp[0][j] = j
+    # Unsigned 16-bit cells are enough unless the strings are huge
+    typecode = 'H' if max(n, m) < 0xFFFF else 'L'
 
-    # Fill DP table
+    # Base case: converting the empty prefix of s1 into s2[0..j]
+    prev = array(typecode, [min(j, cap) for j in range(m+1)])
+    curr = array(typecode, [cap]*(m+1))
+
+    # Fill DP table row by row, restricted to the band
     for i in range(1, n+1):
-        for j in range(1, m+1):
+        lo = max(1, i - band)
+        hi = min(m, i + band)
+
+        left = curr[lo-1] = i if lo == 1 else cap
+        diag = prev[lo-1]
+        ai = a[i-1]
+
+        # dp[i][j-1] and dp[i-1][j-1] are carried in locals, so each
+        # cell costs one load and one store into the row buffers
+        for j in range(lo, hi+1):
+            up = prev[j]
 
-            if s1[i-1] == s2[j-1]:
-                dp[i][j] = dp[i-1][j-1]   # no cost
+            if ai == b[base + j]:
+                left = diag               # no cost
             else:
-                dp[i][j] = 1 + min(
-                    dp[i-1][j],    # deletion
-                    dp[i][j-1],    # insertion
-                    dp[i-1][j-1]   # substitution
+                left = 1 + min(
+                    up,       # deletion
+                    left,     # insertion
+                    diag      # substitution
                 )
 
-    return dp[n][m]
+            curr[j] = left
+            diag = up
+
+        # Early exit: every later row can only be larger
+        if max_k is not None and min(curr[lo-1:hi+1]) > max_k:
+            return cap
+
+        prev, curr = curr, prev
+
+    return min(prev[m], cap)
+
+
+_UNROLL_LIMIT = 64
+
+
+@functools.lru_cache(maxsize=None)
+def _make_window_dp(m):
+    """
+    Generate the window DP specialised for pattern length m.
+
+    The j-loop over the m window characters is unrolled into straight-
+    line code: the previous DP row lives in locals d1..dm and the window
+    characters in c1..cm, so the interpreter executes no inner loop, no
+    range object and no array indexing per cell. Built once per m.
+
+    The generated dp(a, b, off, max_k) equals
+    _levenshtein_range(a, b, off, m, max_k) for len(a) == m.
+    """
+    row = ', '.join(f'd{j}' for j in range(1, m+1))
+    src = ['def dp(a, b, off, max_k):']
+    src += [f'    c{j} = b[off + {j-1}]' for j in range(1, m+1)]
+    src += [f'    {row} = {", ".join(str(j) for j in range(1, m+1))}',
+            '    for i, ai in enumerate(a, 1):',
+            '        diag = i - 1',
+            '        left = i']
+    for j in range(1, m+1):
+        src += [f'        up = d{j}',
+                f'        if ai == c{j}:',
+                f'            d{j} = left = diag',
+                f'        else:',
+                f'            if up < left: left = up',
+                f'            if diag < left: left = diag',
+                f'            d{j} = left = left + 1',
+                f'        diag = up']
+    row_min = f'min({row})' if m > 1 else 'd1'
+    src += [f'        if {row_min} > max_k:',
+            '            return max_k + 1',
+            f'    return d{m} if d{m} <= max_k else max_k + 1']
+
+    namespace = {}
+    exec('\n'.join(src), namespace)
+    return namespace['dp']
+
+
+def myers_approx(text: str, pattern: str, k: int) -> list:
+    """
+    Sliding-window Levenshtein matching with Myers' bit-vector algorithm.
+
+    Instead of filling the DP table cell by cell, a whole DP column
+    (one entry per pattern character) is encoded in two bit-vectors:
+        vp - positions where the column increases by +1 going down
+        vn - positions where the column decreases by -1 going down
+    Each window character updates the column with a handful of bitwise
+    operations, and the score (bottom cell) is tracked on bit m-1.
+
+    The results are identical to running levenshtein_distance on every
+    window text[i:i+m].
+
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+    k : int
+        Maximum allowed edit distance.
+
+    Returns
+    -------
+    list
+        Starting indices where pattern matches with ≤k edits.
+
+    Complexity
+    ----------
+    Time:  O(n * m) word operations instead of O(n * m^2) cells
+    Space: O(|Σ|)
+    """
+    txt, pat, sigma = encode_pair(text, pattern)
+    return _myers_scan(txt, pat, sigma, k, range(len(txt) - len(pat) + 1))
+
+
+def _myers_scan(txt, pat, sigma, k, starts):
+    """Run the bit-vector distance on the windows beginning at starts."""
+    n, m = len(txt), len(pat)
+
+    if m == 0:
+        return list(range(n + 1))
+
+    # peq[c] has bit j set when pattern[j] == c
+    peq = [0] * sigma
+    for j, c in enumerate(pat):
+        peq[c] |= 1 << j
+
+    full = (1 << m) - 1
+    top = 1 << (m - 1)
+
+    matches = []
+
+    for i in starts:
+        vp, vn, score = full, 0, m   # first column is 0, 1, ..., m
+
+        for c in txt[i:i+m]:
+            eq = peq[c]
+            x = eq | vn
+            d0 = (((x & vp) + vp) ^ vp) | x
+            hp = vn | ~(d0 | vp)
+            hn = vp & d0
+
+            if hp & top:
+                score += 1
+            elif hn & top:
+                score -= 1
+
+            hp = (hp << 1) | 1
+            hn <<= 1
+            vp = (hn | ~(d0 | hp)) & full
+            vn = hp & d0
+
+        if score <= k:
+            matches.append(i)
+
+    return matches
 
 
 def find_approximate_matches(text: str, pattern: str, k: int) -> list:
     """
     Find all positions where pattern matches text with at most k edits.
+
+    Candidate windows are found with a pigeonhole filter that locates
+    exact pattern parts via bytes.find; only those windows are verified
+    with the bit-parallel scan of myers_approx.
     
     Parameters
     ----------
@@ -74,19 +263,87 @@ def find_approximate_matches(text: str, pattern: str, k: int) -> list:
     list
         Starting indices where pattern matches with ≤k edits.
     """
-    matches = []
-    m = len(pattern)
-    n = len(text)
+    txt, pat, sigma = encode_pair(text, pattern)
+
+    # Only verify windows that contain an exact pattern part nearby:
+    # each edit spoils at most one of k+1 pattern parts
+    starts = candidate_windows(txt, pat, k + 1, k)
+    return _myers_scan(txt, pat, sigma, k, starts)
+
+
+def find_approximate_matches_dp(text: str, pattern: str, k: int) -> list:
+    """
+    Sliding-window matching with the classic DP of levenshtein_distance.
+
+    Kept as the dynamic-programming baseline for benchmarks. Text and
+    pattern are encoded once, and every window is read in place from
+    the encoded text, so the loop allocates no per-window slices, and
+    the DP itself is generated for the pattern length (_make_window_dp).
     
-    for i in range(n - m + 1):
-        window = text[i:i+m]
-        distance = levenshtein_distance(pattern, window)
-        if distance <= k:
-            matches.append(i)
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+    k : int
+        Maximum allowed edit distance.
     
+    Returns
+    -------
+    list
+        Starting indices where pattern matches with ≤k edits.
+    """
+    txt, pat, _ = encode_pair(text, pattern)
+    m = len(pat)
+
+    if m == 0:
+        return list(range(len(txt) + 1))
+
+    # Unrolling long patterns would only bloat the generated code
+    if m <= _UNROLL_LIMIT:
+        dp = _make_window_dp(m)
+    else:
+        dp = lambda a, b, off, max_k: _levenshtein_range(a, b, off, m, max_k)
+
+    matches = []
+    for i in range(len(txt) - m + 1):
+        if dp(pat, txt, i, k) <= k:
+            matches.append(i)
     return matches
 
 
+def find_approximate_matches_parallel(text: str, pattern: str, k: int,
+                                      nproc: int = None) -> list:
+    """
+    Parallel version of find_approximate_matches.
+
+    The n-m+1 window comparisons are independent, so the window starts
+    are split into nproc contiguous blocks. Each block gets the text
+    slice it covers plus the m-1 characters of overlap needed by its
+    last window, and is matched in a separate process. Results are
+    shifted back by the block offset and concatenated in order (see
+    sequence_utils.parallel_window_search).
+
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+    k : int
+        Maximum allowed edit distance.
+    nproc : int, optional
+        Number of worker processes (default: os.cpu_count()).
+
+    Returns
+    -------
+    list
+        Starting indices where pattern matches with ≤k edits.
+    """
+    return parallel_window_search(find_approximate_matches, text, pattern, k, nproc)
+
+
 if __name__ == '__main__':
     print("Levenshtein Approximate Matching")
     print("=" * 50)
@@ -0,0 +1,172 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Optional compiled edit-distance kernels.
+
+Typed C loops for the banded DPs of Levenshtein.py and
+Damerau–Levenshtein.py, over the byte codes produced by
+sequence_utils.encode_pair. Build in place with
+
+    cythonize -i _editdist.pyx
+
+When the extension is absent, both modules use their pure-Python DP.
+"""
+
+from libc.stdlib cimport malloc, free
+
+
+cdef inline Py_ssize_t _min2(Py_ssize_t x, Py_ssize_t y) nogil:
+    return x if x < y else y
+
+
+cdef inline Py_ssize_t _max2(Py_ssize_t x, Py_ssize_t y) nogil:
+    return x if x > y else y
+
+
+cpdef Py_ssize_t lev(const unsigned char[::1] a, const unsigned char[::1] b,
+                     Py_ssize_t cutoff=-1):
+    """
+    Levenshtein distance of a against b.
+
+    Same result as levenshtein_distance: with cutoff >= 0 only the
+    band |i - j| <= cutoff is filled and anything larger than cutoff
+    is reported as cutoff + 1.
+    """
+    cdef Py_ssize_t n = a.shape[0], m = b.shape[0]
+    cdef Py_ssize_t band, cap, i, j, lo, hi, left, diag, up, row_min
+    cdef Py_ssize_t *prev
+    cdef Py_ssize_t *curr
+    cdef Py_ssize_t *tmp
+    cdef unsigned char ai
+
+    if cutoff < 0:
+        band = _max2(n, m)
+    elif n - m > cutoff or m - n > cutoff:
+        return cutoff + 1
+    else:
+        band = cutoff
+    cap = band + 1
+
+    prev = <Py_ssize_t *> malloc((m + 1) * sizeof(Py_ssize_t))
+    curr = <Py_ssize_t *> malloc((m + 1) * sizeof(Py_ssize_t))
+    if prev == NULL or curr == NULL:
+        free(prev)
+        free(curr)
+        raise MemoryError()
+
+    try:
+        with nogil:
+            for j in range(m + 1):
+                prev[j] = _min2(j, cap)
+                curr[j] = cap
+
+            for i in range(1, n + 1):
+                lo = _max2(1, i - band)
+                hi = _min2(m, i + band)
+
+                left = i if lo == 1 else cap
+                curr[lo - 1] = left
+                diag = prev[lo - 1]
+                ai = a[i - 1]
+                row_min = left
+
+                for j in range(lo, hi + 1):
+                    up = prev[j]
+                    if ai == b[j - 1]:
+                        left = diag
+                    else:
+                        left = 1 + _min2(_min2(up, left), diag)
+                    curr[j] = left
+                    row_min = _min2(row_min, left)
+                    diag = up
+
+                if cutoff >= 0 and row_min > cutoff:
+                    return cap
+
+                tmp = prev
+                prev = curr
+                curr = tmp
+
+            return _min2(prev[m], cap)
+    finally:
+        free(prev)
+        free(curr)
+
+
+cpdef Py_ssize_t dlev(const unsigned char[::1] a, const unsigned char[::1] b,
+                      Py_ssize_t cutoff=-1):
+    """
+    Damerau–Levenshtein (optimal string alignment) distance of a
+    against b.
+
+    Same result as damerau_levenshtein_distance, with the same cutoff
+    convention as lev.
+    """
+    cdef Py_ssize_t n = a.shape[0], m = b.shape[0]
+    cdef Py_ssize_t band, cap, i, j, lo, hi, left, diag, up, d, row_min
+    cdef Py_ssize_t *prev2
+    cdef Py_ssize_t *prev
+    cdef Py_ssize_t *curr
+    cdef Py_ssize_t *tmp
+    cdef unsigned char ai
+
+    if cutoff < 0:
+        band = _max2(n, m)
+    elif n - m > cutoff or m - n > cutoff:
+        return cutoff + 1
+    else:
+        band = cutoff
+    cap = band + 1
+
+    prev2 = <Py_ssize_t *> malloc((m + 1) * sizeof(Py_ssize_t))
+    prev = <Py_ssize_t *> malloc((m + 1) * sizeof(Py_ssize_t))
+    curr = <Py_ssize_t *> malloc((m + 1) * sizeof(Py_ssize_t))
+    if prev2 == NULL or prev == NULL or curr == NULL:
+        free(prev2)
+        free(prev)
+        free(curr)
+        raise MemoryError()
+
+    try:
+        with nogil:
+            for j in range(m + 1):
+                prev2[j] = cap
+                prev[j] = _min2(j, cap)
+                curr[j] = cap
+
+            for i in range(1, n + 1):
+                lo = _max2(1, i - band)
+                hi = _min2(m, i + band)
+
+                left = i if lo == 1 else cap
+                curr[lo - 1] = left
+                diag = prev[lo - 1]
+                ai = a[i - 1]
+                row_min = left
+
+                for j in range(lo, hi + 1):
+                    up = prev[j]
+                    d = _min2(_min2(up, left) + 1, diag + (ai != b[j - 1]))
+
+                    # transposition of s1[i-2..i-1] with s2[j-2..j-1]
+                    if (i > 1 and j > 1 and ai == b[j - 2]
+                            and a[i - 2] == b[j - 1]):
+                        d = _min2(d, prev2[j - 2] + 1)
+
+                    curr[j] = d
+                    left = d
+                    row_min = _min2(row_min, d)
+                    diag = up
+
+                if cutoff >= 0 and row_min > cutoff:
+                    return cap
+
+                tmp = prev2
+                prev2 = prev
+                prev = curr
+                curr = tmp
+
+            return _min2(prev[m], cap)
+    finally:
+        free(prev2)
+        free(prev)
+        free(curr)
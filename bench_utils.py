@@ -0,0 +1,107 @@
+"""
+Input loading and measurement helpers shared by the benchmark scripts.
+
+benchmark_exact_complete.py and benchmark_fuzzy_matching.py load the
+genome and time and probe their algorithms through these functions, so
+a fix to how time or peak memory is measured applies to both
+benchmarks at once.
+
+Memory probes:
+- 'tracemalloc' reports exact Python allocations; the caller keeps
+  tracemalloc running and each probe only resets the peak.
+- 'rss' reads the process' max resident set size, which is free but
+  only sees growth beyond earlier peaks (and is unavailable on Windows).
+"""
+
+import math
+import mmap
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+
+def load_ecoli_sequence(fasta_path='E-coli.fasta'):
+    """
+    Load E-coli genome sequence from FASTA file.
+
+    The file is memory-mapped, header lines are cut out with a few
+    find() calls, and line breaks are removed with a single
+    bytes.translate pass instead of building one string per line.
+    """
+    if os.path.getsize(fasta_path) == 0:
+        return ''
+
+    chunks = []
+    with open(fasta_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos >= 0:
+                header = mm.find(b'>', pos)
+                if header < 0:
+                    chunks.append(mm[pos:])
+                    break
+                chunks.append(mm[pos:header])
+                pos = mm.find(b'\n', header)   # skip to end of header line
+    return b''.join(chunks).translate(None, b' \t\r\n').decode()
+
+
+def _max_rss():
+    """Peak resident set size of this process so far, in bytes."""
+    if resource is None:
+        raise RuntimeError("resource module is not available on this platform")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def timed(fn, *args, target_seconds=0.2, repeat=5):
+    """
+    Time fn(*args) with timeit and return (seconds per call, result).
+
+    One untimed call provides the result and calibrates `number`, the
+    number of calls per measurement, so that each measurement lasts
+    at least target_seconds. The best of `repeat` measurements is
+    reported, which filters out OS scheduling noise and clock
+    resolution effects on fast algorithms.
+    """
+    start = time.perf_counter()
+    result = fn(*args)
+    first = time.perf_counter() - start
+
+    number = max(1, math.ceil(target_seconds / first)) if first > 0 else 1000
+    times = timeit.Timer(lambda: fn(*args)).repeat(repeat=repeat, number=number)
+    return min(times) / number, result
+
+
+def traced_peak(fn, *args):
+    """
+    Peak bytes allocated while running fn(*args).
+
+    tracemalloc must already be tracing; only the peak is reset, which
+    is far cheaper than starting and stopping the tracer per call.
+    """
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    fn(*args)
+    return tracemalloc.get_traced_memory()[1] - baseline
+
+
+def rss_peak(fn, *args):
+    """Growth of the process' peak RSS while running fn(*args), in bytes."""
+    before = _max_rss()
+    fn(*args)
+    return _max_rss() - before
+
+
+def peak_memory(fn, *args, probe='tracemalloc'):
+    """Measure fn(*args) with the given memory probe ('tracemalloc' or 'rss')."""
+    if probe == 'rss':
+        return rss_peak(fn, *args)
+    return traced_peak(fn, *args)
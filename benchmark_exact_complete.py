@@ -20,94 +20,76 @@ Two graphs:
 """
 
 import os
-import time
+import functools
 import re
 import tracemalloc
 import matplotlib.pyplot as plt
 
+from bench_utils import timed, peak_memory, load_ecoli_sequence
+
 # Import exact matching algorithms
-from kmp import kmp_search
-from boyer_moore import boyer_moore_search
-from horspool import horspool_search
+# The textbook implementations are benchmarked, not the str.find fast paths
+from kmp import kmp_search_pedagogical as kmp_search
+from boyer_moore import boyer_moore_search_pedagogical as boyer_moore_search
+from horspool import horspool_search_pedagogical as horspool_search
 from suffix_trees import NaiveSuffixTree
 from ukkonen import SuffixTree
 from python_regex import DNARegex
 
 
-def load_ecoli_sequence(fasta_path='E-coli.fasta'):
-    """Load E-coli genome sequence from FASTA file."""
-    sequence = []
-    with open(fasta_path, 'r') as f:
-        for line in f:
-            if not line.startswith('>'):
-                sequence.append(line.strip())
-    return ''.join(sequence)
-
-
 # =============================================================================
 # REGEX WRAPPER
 # =============================================================================
 
+@functools.lru_cache(maxsize=None)
+def _compile_literal(pattern):
+    """Escape pattern for exact matching and compile it once."""
+    return DNARegex(re.escape(pattern))
+
+
 def regex_search(text, pattern):
-    """Search using DNARegex wrapper."""
-    # Escape pattern for exact matching
-    escaped_pattern = re.escape(pattern)
-    dna_regex = DNARegex(escaped_pattern)
-    matches = [m.start() for m in dna_regex.find_iter(text)]
-    return matches
+    """Search using DNARegex wrapper (compiled pattern is cached)."""
+    return [m.start() for m in _compile_literal(pattern).find_iter(text)]
 
 
 # =============================================================================
 # TIME BENCHMARKING
 # =============================================================================
 
+
 def benchmark_time_kmp(text, pattern):
     """Measure time for KMP."""
-    start = time.time()
-    matches = kmp_search(text, pattern)
-    elapsed = time.time() - start
+    elapsed, matches = timed(kmp_search, text, pattern)
     return elapsed, len(matches)
 
 
 def benchmark_time_boyer_moore(text, pattern):
     """Measure time for Boyer-Moore."""
-    start = time.time()
-    matches = boyer_moore_search(text, pattern)
-    elapsed = time.time() - start
+    elapsed, matches = timed(boyer_moore_search, text, pattern)
     return elapsed, len(matches)
 
 
 def benchmark_time_horspool(text, pattern):
     """Measure time for Horspool."""
-    start = time.time()
-    matches = horspool_search(text, pattern)
-    elapsed = time.time() - start
+    elapsed, matches = timed(horspool_search, text, pattern)
     return elapsed, len(matches)
 
 
 def benchmark_time_suffix_tree(text, pattern):
-    """Measure time for Naive Suffix Tree."""
-    start = time.time()
-    tree = NaiveSuffixTree(text)
-    result = tree.has_substring(pattern)
-    elapsed = time.time() - start
+    """Measure time for Naive Suffix Tree (construction + query)."""
+    elapsed, result = timed(lambda: NaiveSuffixTree(text).has_substring(pattern))
     return elapsed, 1 if result else 0
 
 
 def benchmark_time_ukkonen(text, pattern):
-    """Measure time for Ukkonen's Suffix Tree."""
-    start = time.time()
-    tree = SuffixTree(text)
-    result = tree.has_substring(pattern)
-    elapsed = time.time() - start
+    """Measure time for Ukkonen's Suffix Tree (construction + query)."""
+    elapsed, result = timed(lambda: SuffixTree(text).has_substring(pattern))
     return elapsed, 1 if result else 0
 
 
 def benchmark_time_regex(text, pattern):
     """Measure time for Python Regex."""
-    start = time.time()
-    matches = regex_search(text, pattern)
-    elapsed = time.time() - start
+    elapsed, matches = timed(regex_search, text, pattern)
     return elapsed, len(matches)
 
 
@@ -130,6 +112,18 @@ def run_time_benchmarks(full_sequence, pattern, text_sizes):
     print(f"Text sizes: {text_sizes}")
     print("="*60)
     
+    # Warmup: run every algorithm once on a small text so that imports,
+    # first-call allocations and page faults are not billed to the
+    # first measured size. Results are discarded.
+    # tracemalloc is never active here; it is only started inside
+    # run_memory_benchmarks, so it cannot distort the timings.
+    print("\nWarming up...")
+    warmup_text = full_sequence[:10000]
+    for benchmark in (benchmark_time_kmp, benchmark_time_boyer_moore,
+                      benchmark_time_horspool, benchmark_time_suffix_tree,
+                      benchmark_time_ukkonen, benchmark_time_regex):
+        benchmark(warmup_text, pattern)
+    
     for text_size in text_sizes:
         text = full_sequence[:text_size]
         print(f"\nText size: {text_size:,} bases")
@@ -201,60 +195,39 @@ def run_time_benchmarks(full_sequence, pattern, text_sizes):
 # MEMORY BENCHMARKING
 # =============================================================================
 
+# Peak-memory probe passed to bench_utils by the benchmark_memory_*
+# functions and the combined pass ('tracemalloc' or 'rss', see bench_utils)
+MEMORY_PROBE = 'tracemalloc'
+
+
 def benchmark_memory_kmp(text, pattern):
     """Measure memory for KMP."""
-    tracemalloc.start()
-    matches = kmp_search(text, pattern)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(kmp_search, text, pattern, probe=MEMORY_PROBE)
 
 
 def benchmark_memory_boyer_moore(text, pattern):
     """Measure memory for Boyer-Moore."""
-    tracemalloc.start()
-    matches = boyer_moore_search(text, pattern)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(boyer_moore_search, text, pattern, probe=MEMORY_PROBE)
 
 
 def benchmark_memory_horspool(text, pattern):
     """Measure memory for Horspool."""
-    tracemalloc.start()
-    matches = horspool_search(text, pattern)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(horspool_search, text, pattern, probe=MEMORY_PROBE)
 
 
 def benchmark_memory_suffix_tree(text, pattern):
     """Measure memory for Naive Suffix Tree."""
-    tracemalloc.start()
-    tree = NaiveSuffixTree(text)
-    result = tree.has_substring(pattern)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(lambda: NaiveSuffixTree(text).has_substring(pattern), probe=MEMORY_PROBE)
 
 
 def benchmark_memory_ukkonen(text, pattern):
     """Measure memory for Ukkonen."""
-    tracemalloc.start()
-    tree = SuffixTree(text)
-    result = tree.has_substring(pattern)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(lambda: SuffixTree(text).has_substring(pattern), probe=MEMORY_PROBE)
 
 
 def benchmark_memory_regex(text, pattern):
     """Measure memory for Python Regex."""
-    tracemalloc.start()
-    matches = regex_search(text, pattern)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(regex_search, text, pattern, probe=MEMORY_PROBE)
 
 
 def run_memory_benchmarks(full_sequence, pattern, text_sizes):
@@ -275,6 +248,10 @@ def run_memory_benchmarks(full_sequence, pattern, text_sizes):
     print(f"Text sizes: {text_sizes}")
     print("="*60)
     
+    # Trace once for the whole run; each probe only resets the peak
+    if MEMORY_PROBE == 'tracemalloc':
+        tracemalloc.start()
+
     for text_size in text_sizes:
         text = full_sequence[:text_size]
         print(f"\nText size: {text_size:,} bases")
@@ -339,106 +316,166 @@ def run_memory_benchmarks(full_sequence, pattern, text_sizes):
             print(f"        ERROR: {e}")
             results['Python Regex'][text_size] = None
     
+    if MEMORY_PROBE == 'tracemalloc':
+        tracemalloc.stop()
+
     return results
 
 
+# =============================================================================
+# COMBINED BENCHMARKING
+# =============================================================================
+
+# Run time and memory from one call (run_combined_benchmarks), with a
+# single warmup, instead of calling the two benchmark runners
+COMBINED = True
+
+
+def suffix_tree_query(text, pattern):
+    """Naive suffix tree construction + query, as one callable."""
+    return NaiveSuffixTree(text).has_substring(pattern)
+
+
+def ukkonen_query(text, pattern):
+    """Ukkonen suffix tree construction + query, as one callable."""
+    return SuffixTree(text).has_substring(pattern)
+
+
+ALGORITHMS = {
+    'KMP': kmp_search,
+    'Boyer-Moore': boyer_moore_search,
+    'Horspool': horspool_search,
+    'Suffix Tree': suffix_tree_query,
+    'Ukkonen': ukkonen_query,
+    'Python Regex': regex_search,
+}
+
+
+def run_combined_benchmarks(full_sequence, pattern, text_sizes):
+    """
+    Run time and memory benchmarks for all text sizes in one run.
+
+    The algorithms are warmed up once, then every (algorithm, text size)
+    is timed in an untraced pass and finally probed in a single traced
+    pass that starts tracemalloc once. The tracer never runs during a
+    timed call.
+
+    Returns (time_results, memory_results) in the same format as
+    run_time_benchmarks and run_memory_benchmarks.
+    """
+    time_results = {algo_name: {} for algo_name in ALGORITHMS}
+    memory_results = {algo_name: {} for algo_name in ALGORITHMS}
+    
+    print("\n" + "="*60)
+    print("TIME + MEMORY BENCHMARK - EXACT MATCHING ALGORITHMS")
+    print("="*60)
+    print(f"Pattern length (P): {len(pattern)} bases")
+    print(f"Pattern: {pattern}")
+    print(f"Text sizes: {text_sizes}")
+    print("="*60)
+    
+    # Warmup, as in run_time_benchmarks
+    print("\nWarming up...")
+    warmup_text = full_sequence[:10000]
+    for fn in ALGORITHMS.values():
+        fn(warmup_text, pattern)
+
+    total = len(ALGORITHMS)
+
+    # Pass 1: time everything with tracemalloc off
+    print("\nTiming (untraced):")
+    for text_size in text_sizes:
+        text = full_sequence[:text_size]
+        print(f"\nText size: {text_size:,} bases")
+        
+        for step, (algo_name, fn) in enumerate(ALGORITHMS.items(), 1):
+            print(f"  [{step}/{total}] Running {algo_name}...")
+            try:
+                elapsed, _ = timed(fn, text, pattern)
+                time_results[algo_name][text_size] = elapsed
+                print(f"        Time: {elapsed:.6f}s")
+            except Exception as e:
+                print(f"        ERROR: {e}")
+                time_results[algo_name][text_size] = None
+
+    # Pass 2: trace once for all peaks; each probe only resets the peak
+    if MEMORY_PROBE == 'tracemalloc':
+        tracemalloc.start()
+
+    print("\nMemory (traced):")
+    for text_size in text_sizes:
+        text = full_sequence[:text_size]
+        print(f"\nText size: {text_size:,} bases")
+        
+        for step, (algo_name, fn) in enumerate(ALGORITHMS.items(), 1):
+            print(f"  [{step}/{total}] Measuring {algo_name} memory...")
+            try:
+                mem = peak_memory(fn, text, pattern, probe=MEMORY_PROBE)
+                memory_results[algo_name][text_size] = mem
+                print(f"        Memory: {mem:,} bytes ({mem/(1024*1024):.2f} MB)")
+            except Exception as e:
+                print(f"        ERROR: {e}")
+                memory_results[algo_name][text_size] = None
+
+    if MEMORY_PROBE == 'tracemalloc':
+        tracemalloc.stop()
+
+    return time_results, memory_results
+
+
 # =============================================================================
 # PLOTTING
 # =============================================================================
 
+def _plot_series(ax, results, algos):
+    """
+    Draw one line per algorithm in algos, skipping failed (None) runs.
+
+    The x values are sorted once for the whole axes; each algorithm then
+    costs a single ax.plot call.
+    """
+    sizes = sorted(next(iter(results.values())))
+
+    for algo_name in algos:
+        if algo_name in results:
+            measurements = results[algo_name]
+            points = [(size / 1000, measurements[size])
+                      for size in sizes if measurements.get(size) is not None]
+            if points:
+                xs, ys = zip(*points)
+                ax.plot(xs, ys, marker='o', label=algo_name, linewidth=2, markersize=6)
+
+
 def plot_results(time_results, memory_results):
-    """Create plots with separate memory graphs for better visibility."""
-    
-    # =========================================================================
-    # FIGURE 1: TIME COMPARISON (split if needed)
-    # =========================================================================
-    fig1, axes1 = plt.subplots(1, 2, figsize=(16, 7))
+    """Create one 2x2 figure: time on top, memory below, split by algorithm family."""
+    fig, ((ax_time, ax_time_tree), (ax_mem, ax_mem_tree)) = plt.subplots(2, 2, figsize=(16, 13))
     
-    # Separate tree-based from pattern matching algorithms for time
+    # Separate tree-based from pattern matching algorithms (different scales)
     pattern_matching_algos = ['KMP', 'Boyer-Moore', 'Horspool', 'Python Regex']
     tree_algos = ['Suffix Tree', 'Ukkonen']
     
-    # Plot 1a: Pattern matching algorithms time
-    for algo_name in pattern_matching_algos:
-        if algo_name in time_results:
-            measurements = time_results[algo_name]
-            text_sizes = sorted([k for k in measurements.keys() if measurements[k] is not None])
-            times = [measurements[k] for k in text_sizes]
-            text_sizes_kb = [size / 1000 for size in text_sizes]
-            
-            axes1[0].plot(text_sizes_kb, times, marker='o', label=algo_name, linewidth=2, markersize=6)
-    
-    axes1[0].set_xlabel('Text Size (KB)', fontsize=12)
-    axes1[0].set_ylabel('Time (seconds)', fontsize=12)
-    axes1[0].set_title('Time: Pattern Matching Algorithms\n(P=20 bases)', fontsize=13, fontweight='bold')
-    axes1[0].legend(fontsize=9, loc='best')
-    axes1[0].grid(True, alpha=0.3)
-    
-    # Plot 1b: Tree-based algorithms time (separate scale)
-    for algo_name in tree_algos:
-        if algo_name in time_results:
-            measurements = time_results[algo_name]
-            text_sizes = sorted([k for k in measurements.keys() if measurements[k] is not None])
-            times = [measurements[k] for k in text_sizes]
-            text_sizes_kb = [size / 1000 for size in text_sizes]
-            
-            axes1[1].plot(text_sizes_kb, times, marker='o', label=algo_name, linewidth=2, markersize=6)
-    
-    axes1[1].set_xlabel('Text Size (KB)', fontsize=12)
-    axes1[1].set_ylabel('Time (seconds)', fontsize=12)
-    axes1[1].set_title('Time: Tree-Based Algorithms\n(P=20 bases)', fontsize=13, fontweight='bold')
-    axes1[1].legend(fontsize=9, loc='best')
-    axes1[1].grid(True, alpha=0.3)
-    
-    plt.suptitle('Time Comparison - Exact Matching Algorithms', fontsize=14, fontweight='bold', y=1.00)
-    plt.tight_layout()
-    plt.savefig('exact_matching_time_benchmark.png', dpi=300, bbox_inches='tight')
-    print(f"\nTime plot saved to exact_matching_time_benchmark.png")
-    plt.show()
-    
-    # =========================================================================
-    # FIGURE 2: MEMORY COMPARISON (split for visibility)
-    # =========================================================================
-    fig2, axes2 = plt.subplots(1, 2, figsize=(16, 7))
-    
-    # Plot 2a: Pattern matching algorithms memory
-    for algo_name in pattern_matching_algos:
-        if algo_name in memory_results:
-            measurements = memory_results[algo_name]
-            text_sizes = sorted([k for k in measurements.keys() if measurements[k] is not None])
-            memory = [measurements[k] for k in text_sizes]
-            text_sizes_kb = [size / 1000 for size in text_sizes]
-            
-            axes2[0].plot(text_sizes_kb, memory, marker='o', label=algo_name, linewidth=2, markersize=6)
-    
-    axes2[0].set_xlabel('Text Size (KB)', fontsize=12)
-    axes2[0].set_ylabel('Peak Memory (bytes)', fontsize=12)
-    axes2[0].set_title('Memory: Pattern Matching Algorithms\n(P=20 bases)', fontsize=13, fontweight='bold')
-    axes2[0].legend(fontsize=9, loc='best')
-    axes2[0].grid(True, alpha=0.3)
-    axes2[0].yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
+    panels = [
+        (ax_time, time_results, pattern_matching_algos, 'Time (seconds)', 'Time: Pattern Matching Algorithms'),
+        (ax_time_tree, time_results, tree_algos, 'Time (seconds)', 'Time: Tree-Based Algorithms'),
+        (ax_mem, memory_results, pattern_matching_algos, 'Peak Memory (bytes)', 'Memory: Pattern Matching Algorithms'),
+        (ax_mem_tree, memory_results, tree_algos, 'Peak Memory (bytes)', 'Memory: Tree-Based Algorithms'),
+    ]
     
-    # Plot 2b: Tree-based algorithms memory (separate scale)
-    for algo_name in tree_algos:
-        if algo_name in memory_results:
-            measurements = memory_results[algo_name]
-            text_sizes = sorted([k for k in measurements.keys() if measurements[k] is not None])
-            memory = [measurements[k] for k in text_sizes]
-            text_sizes_kb = [size / 1000 for size in text_sizes]
-            
-            axes2[1].plot(text_sizes_kb, memory, marker='o', label=algo_name, linewidth=2, markersize=6)
+    for ax, results, algos, ylabel, title in panels:
+        _plot_series(ax, results, algos)
+        ax.set_xlabel('Text Size (KB)', fontsize=12)
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.set_title(f'{title}\n(P=20 bases)', fontsize=13, fontweight='bold')
+        ax.legend(fontsize=9, loc='best')
+        ax.grid(True, alpha=0.3)
     
-    axes2[1].set_xlabel('Text Size (KB)', fontsize=12)
-    axes2[1].set_ylabel('Peak Memory (bytes)', fontsize=12)
-    axes2[1].set_title('Memory: Tree-Based Algorithms\n(P=20 bases)', fontsize=13, fontweight='bold')
-    axes2[1].legend(fontsize=9, loc='best')
-    axes2[1].grid(True, alpha=0.3)
-    axes2[1].yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
+    for ax in (ax_mem, ax_mem_tree):
+        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
     
-    plt.suptitle('Memory Comparison - Exact Matching Algorithms', fontsize=14, fontweight='bold', y=1.00)
+    plt.suptitle('Exact Matching Algorithm Comparison', fontsize=14, fontweight='bold', y=1.00)
     plt.tight_layout()
-    plt.savefig('exact_matching_memory_benchmark.png', dpi=300, bbox_inches='tight')
-    print(f"\nMemory plot saved to exact_matching_memory_benchmark.png")
+    fig.savefig('exact_matching_benchmark.png', dpi=300, bbox_inches='tight')
+    print(f"\nPlot saved to exact_matching_benchmark.png")
     plt.show()
 
 
@@ -473,8 +510,11 @@ def main():
     print(f"  Text size (T): {text_sizes[0]:,} to {text_sizes[-1]:,} bases ({len(text_sizes)} steps)")
     
     # Run benchmarks
-    time_results = run_time_benchmarks(full_sequence, pattern, text_sizes)
-    memory_results = run_memory_benchmarks(full_sequence, pattern, text_sizes)
+    if COMBINED:
+        time_results, memory_results = run_combined_benchmarks(full_sequence, pattern, text_sizes)
+    else:
+        time_results = run_time_benchmarks(full_sequence, pattern, text_sizes)
+        memory_results = run_memory_benchmarks(full_sequence, pattern, text_sizes)
     
     # Plot results
     print("\nGenerating plots...")
@@ -5,6 +5,7 @@ Compares:
 - Levenshtein Distance
 - Damerau-Levenshtein Distance  
 - Shift-Or (approximate matching)
+- Myers (bit-parallel Levenshtein)
 
 Fixed Parameters:
 - Text size (T): 1,000,000 bases from E-coli genome
@@ -19,12 +20,14 @@ Two graphs:
 """
 
 import os
-import time
 import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 
+from bench_utils import timed, peak_memory, load_ecoli_sequence
+
 # Import fuzzy matching algorithms
-from Levenshtein import levenshtein_distance
+from Levenshtein import find_approximate_matches_dp as levenshtein_matches_dp, myers_approx
 from shift_or import shift_or_approx
 
 # Import Damerau-Levenshtein (handle special filename)
@@ -32,90 +35,151 @@ import importlib.util
 spec = importlib.util.spec_from_file_location("damerau", "Damerau–Levenshtein.py")
 damerau_module = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(damerau_module)
-damerau_levenshtein_distance = damerau_module.damerau_levenshtein_distance
-
-
-def load_ecoli_sequence(fasta_path='E-coli.fasta'):
-    """Load E-coli genome sequence from FASTA file."""
-    sequence = []
-    with open(fasta_path, 'r') as f:
-        for line in f:
-            if not line.startswith('>'):
-                sequence.append(line.strip())
-    return ''.join(sequence)
+damerau_matches_dp = damerau_module.find_approximate_matches_dp
 
 
 def find_approximate_match_levenshtein(text, pattern, k):
     """
     Find all positions in text where pattern matches with at most k edits.
-    Uses sliding window with Levenshtein distance.
+    Uses sliding window with Levenshtein distance, cut off at k.
     """
-    matches = []
-    m = len(pattern)
-    n = len(text)
-    
-    for i in range(n - m + 1):
-        window = text[i:i+m]
-        distance = levenshtein_distance(pattern, window)
-        if distance <= k:
-            matches.append(i)
-    
-    return matches
+    return levenshtein_matches_dp(text, pattern, k)
 
 
 def find_approximate_match_damerau(text, pattern, k):
     """
     Find all positions in text where pattern matches with at most k edits.
-    Uses sliding window with Damerau-Levenshtein distance.
+    Uses sliding window with Damerau-Levenshtein distance, cut off at k.
     """
-    matches = []
-    m = len(pattern)
-    n = len(text)
-    
-    for i in range(n - m + 1):
-        window = text[i:i+m]
-        distance = damerau_levenshtein_distance(pattern, window)
-        if distance <= k:
-            matches.append(i)
-    
-    return matches
+    return damerau_matches_dp(text, pattern, k)
 
 
 # =============================================================================
 # TIME BENCHMARKING
 # =============================================================================
 
+
 def benchmark_time_levenshtein(text, pattern, k):
     """Measure time for Levenshtein-based approximate matching."""
-    start = time.time()
-    matches = find_approximate_match_levenshtein(text, pattern, k)
-    elapsed = time.time() - start
+    elapsed, matches = timed(find_approximate_match_levenshtein, text, pattern, k)
     return elapsed, len(matches)
 
 
 def benchmark_time_damerau(text, pattern, k):
     """Measure time for Damerau-Levenshtein-based approximate matching."""
-    start = time.time()
-    matches = find_approximate_match_damerau(text, pattern, k)
-    elapsed = time.time() - start
+    elapsed, matches = timed(find_approximate_match_damerau, text, pattern, k)
     return elapsed, len(matches)
 
 
 def benchmark_time_shift_or(text, pattern, k):
     """Measure time for Shift-Or approximate matching."""
-    start = time.time()
-    matches = shift_or_approx(text, pattern, k)
-    elapsed = time.time() - start
+    elapsed, matches = timed(shift_or_approx, text, pattern, k)
+    return elapsed, len(matches)
+
+
+def benchmark_time_myers(text, pattern, k):
+    """Measure time for Myers' bit-parallel Levenshtein matching."""
+    elapsed, matches = timed(myers_approx, text, pattern, k)
     return elapsed, len(matches)
 
 
-def run_time_benchmarks(text, pattern, k_values):
+TIME_BENCHMARKS = {
+    'Levenshtein': benchmark_time_levenshtein,
+    'Damerau-Levenshtein': benchmark_time_damerau,
+    'Shift-Or': benchmark_time_shift_or,
+    'Myers': benchmark_time_myers,
+}
+
+# Default worker processes per benchmark run. The (algorithm, k)
+# measurements share no state, so they can run in parallel. Timing
+# defaults to one process: concurrent runs compete for cores and caches
+# and inflate each other's times. Memory peaks are unaffected by that,
+# so the memory pass uses every core.
+WORKERS = 1
+MEMORY_WORKERS = os.cpu_count() or 1
+
+# Set in every worker by _init_worker, so that each job only pickles
+# its (algorithm, k) pair instead of the 100K-base text
+_worker_text = None
+_worker_pattern = None
+
+
+def _init_worker(text, pattern):
+    """Pool initializer: store the shared benchmark input once per process."""
+    global _worker_text, _worker_pattern
+    _worker_text = text
+    _worker_pattern = pattern
+
+
+def _time_job(algo_name, k):
+    """Run one time measurement on the worker's text and pattern."""
+    return TIME_BENCHMARKS[algo_name](_worker_text, _worker_pattern, k)
+
+
+def _warm_up(text, pattern):
+    """
+    Run every algorithm once on a short slice of text.
+
+    The first call of an algorithm pays one-time costs (generating the
+    window DP for the pattern length, filling the per-pattern mask
+    caches); warming up keeps them out of the first measured k.
+    """
+    warmup_text = text[:10000]
+    for fn in ALGORITHMS.values():
+        fn(warmup_text, pattern, 0)
+
+
+def _ensure_tracing():
+    """
+    Start tracemalloc in this process if the probe needs it.
+
+    Pool workers start without tracing; they warm up first, then
+    tracemalloc stays on for the life of the worker and each probe
+    only resets the peak.
+    """
+    if MEMORY_PROBE == 'tracemalloc' and not tracemalloc.is_tracing():
+        _warm_up(_worker_text, _worker_pattern)
+        tracemalloc.start()
+
+
+def _memory_job(algo_name, k):
+    """Run one memory measurement on the worker's text and pattern."""
+    _ensure_tracing()
+    return MEMORY_BENCHMARKS[algo_name](_worker_text, _worker_pattern, k)
+
+
+def _run_jobs(job, jobs, text, pattern, workers):
+    """
+    Run job(algo_name, k) for every (algo_name, k) in jobs.
+
+    Yields ((algo_name, k), result) in the order of jobs; a failing
+    measurement yields its exception instead of a result.
+    """
+    if workers <= 1:
+        _init_worker(text, pattern)
+        for args in jobs:
+            try:
+                yield args, job(*args)
+            except Exception as e:
+                yield args, e
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                             initializer=_init_worker,
+                             initargs=(text, pattern)) as executor:
+        futures = [(args, executor.submit(job, *args)) for args in jobs]
+        for args, future in futures:
+            try:
+                yield args, future.result()
+            except Exception as e:
+                yield args, e
+
+
+def run_time_benchmarks(text, pattern, k_values, workers=None):
     """Run time benchmarks for all edit distances."""
-    results = {
-        'Levenshtein': {},
-        'Damerau-Levenshtein': {},
-        'Shift-Or': {}
-    }
+    if workers is None:
+        workers = WORKERS
+    results = {algo_name: {} for algo_name in TIME_BENCHMARKS}
     
     print("\n" + "="*60)
     print("TIME BENCHMARK - FUZZY MATCHING ALGORITHMS")
@@ -124,40 +188,25 @@ def run_time_benchmarks(text, pattern, k_values):
     print(f"Pattern length (P): {len(pattern)} bases")
     print(f"Pattern: {pattern}")
     print(f"Edit distances (k): {k_values}")
+    print(f"Worker processes: {workers}")
     print("="*60)
     
-    for k in k_values:
-        print(f"\nEdit distance k = {k}:")
-        
-        # Levenshtein
-        print(f"  [1/3] Running Levenshtein...")
-        try:
-            elapsed, num_matches = benchmark_time_levenshtein(text, pattern, k)
-            results['Levenshtein'][k] = elapsed
-            print(f"        Time: {elapsed:.4f}s, Matches: {num_matches}")
-        except Exception as e:
-            print(f"        ERROR: {e}")
-            results['Levenshtein'][k] = None
-        
-        # Damerau-Levenshtein
-        print(f"  [2/3] Running Damerau-Levenshtein...")
-        try:
-            elapsed, num_matches = benchmark_time_damerau(text, pattern, k)
-            results['Damerau-Levenshtein'][k] = elapsed
-            print(f"        Time: {elapsed:.4f}s, Matches: {num_matches}")
-        except Exception as e:
-            print(f"        ERROR: {e}")
-            results['Damerau-Levenshtein'][k] = None
+    jobs = [(algo_name, k) for k in k_values for algo_name in TIME_BENCHMARKS]
+    total = len(TIME_BENCHMARKS)
+    
+    for index, ((algo_name, k), outcome) in enumerate(_run_jobs(_time_job, jobs, text, pattern, workers)):
+        step = index % total + 1
+        if step == 1:
+            print(f"\nEdit distance k = {k}:")
+        print(f"  [{step}/{total}] {algo_name}...")
         
-        # Shift-Or
-        print(f"  [3/3] Running Shift-Or...")
-        try:
-            elapsed, num_matches = benchmark_time_shift_or(text, pattern, k)
-            results['Shift-Or'][k] = elapsed
+        if isinstance(outcome, Exception):
+            print(f"        ERROR: {outcome}")
+            results[algo_name][k] = None
+        else:
+            elapsed, num_matches = outcome
+            results[algo_name][k] = elapsed
             print(f"        Time: {elapsed:.4f}s, Matches: {num_matches}")
-        except Exception as e:
-            print(f"        ERROR: {e}")
-            results['Shift-Or'][k] = None
     
     return results
 
@@ -166,40 +215,44 @@ def run_time_benchmarks(text, pattern, k_values):
 # MEMORY BENCHMARKING
 # =============================================================================
 
+# Peak-memory probe passed to bench_utils by the benchmark_memory_*
+# functions and the combined pass ('tracemalloc' or 'rss', see bench_utils)
+MEMORY_PROBE = 'tracemalloc'
+
+
 def benchmark_memory_levenshtein(text, pattern, k):
     """Measure memory for Levenshtein-based approximate matching."""
-    tracemalloc.start()
-    matches = find_approximate_match_levenshtein(text, pattern, k)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(find_approximate_match_levenshtein, text, pattern, k, probe=MEMORY_PROBE)
 
 
 def benchmark_memory_damerau(text, pattern, k):
     """Measure memory for Damerau-Levenshtein-based approximate matching."""
-    tracemalloc.start()
-    matches = find_approximate_match_damerau(text, pattern, k)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(find_approximate_match_damerau, text, pattern, k, probe=MEMORY_PROBE)
 
 
 def benchmark_memory_shift_or(text, pattern, k):
     """Measure memory for Shift-Or approximate matching."""
-    tracemalloc.start()
-    matches = shift_or_approx(text, pattern, k)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    return peak
+    return peak_memory(shift_or_approx, text, pattern, k, probe=MEMORY_PROBE)
+
+
+def benchmark_memory_myers(text, pattern, k):
+    """Measure memory for Myers' bit-parallel Levenshtein matching."""
+    return peak_memory(myers_approx, text, pattern, k, probe=MEMORY_PROBE)
+
 
+MEMORY_BENCHMARKS = {
+    'Levenshtein': benchmark_memory_levenshtein,
+    'Damerau-Levenshtein': benchmark_memory_damerau,
+    'Shift-Or': benchmark_memory_shift_or,
+    'Myers': benchmark_memory_myers,
+}
 
-def run_memory_benchmarks(text, pattern, k_values):
+
+def run_memory_benchmarks(text, pattern, k_values, workers=None):
     """Run memory benchmarks for all edit distances."""
-    results = {
-        'Levenshtein': {},
-        'Damerau-Levenshtein': {},
-        'Shift-Or': {}
-    }
+    if workers is None:
+        workers = MEMORY_WORKERS
+    results = {algo_name: {} for algo_name in MEMORY_BENCHMARKS}
     
     print("\n" + "="*60)
     print("MEMORY BENCHMARK - FUZZY MATCHING ALGORITHMS")
@@ -207,42 +260,132 @@ def run_memory_benchmarks(text, pattern, k_values):
     print(f"Text size (T): {len(text):,} bases")
     print(f"Pattern length (P): {len(pattern)} bases")
     print(f"Edit distances (k): {k_values}")
+    print(f"Worker processes: {workers}")
     print("="*60)
     
-    for k in k_values:
-        print(f"\nEdit distance k = {k}:")
+    # Serial runs warm up and trace in this process, once for the whole
+    # run; pool workers do both in _ensure_tracing
+    trace_here = workers <= 1 and MEMORY_PROBE == 'tracemalloc' and not tracemalloc.is_tracing()
+    if trace_here:
+        _warm_up(text, pattern)
+        tracemalloc.start()
+    
+    jobs = [(algo_name, k) for k in k_values for algo_name in MEMORY_BENCHMARKS]
+    total = len(MEMORY_BENCHMARKS)
+    
+    for index, ((algo_name, k), outcome) in enumerate(_run_jobs(_memory_job, jobs, text, pattern, workers)):
+        step = index % total + 1
+        if step == 1:
+            print(f"\nEdit distance k = {k}:")
+        print(f"  [{step}/{total}] {algo_name} memory...")
         
-        # Levenshtein
-        print(f"  [1/3] Measuring Levenshtein memory...")
-        try:
-            mem = benchmark_memory_levenshtein(text, pattern, k)
-            results['Levenshtein'][k] = mem
+        if isinstance(outcome, Exception):
+            print(f"        ERROR: {outcome}")
+            results[algo_name][k] = None
+        else:
+            mem = outcome
+            results[algo_name][k] = mem
             print(f"        Memory: {mem:,} bytes ({mem/(1024*1024):.2f} MB)")
-        except Exception as e:
-            print(f"        ERROR: {e}")
-            results['Levenshtein'][k] = None
+    
+    if trace_here:
+        tracemalloc.stop()
+
+    return results
+
+
+# =============================================================================
+# COMBINED BENCHMARKING
+# =============================================================================
+
+# Run time and memory from one call (run_combined_benchmarks), with a
+# single warmup, instead of calling the two benchmark runners
+COMBINED = True
+
+ALGORITHMS = {
+    'Levenshtein': find_approximate_match_levenshtein,
+    'Damerau-Levenshtein': find_approximate_match_damerau,
+    'Shift-Or': shift_or_approx,
+    'Myers': myers_approx,
+}
+
+
+def run_combined_benchmarks(text, pattern, k_values, workers=None, memory_workers=None):
+    """
+    Run time and memory benchmarks for all edit distances in one run.
+
+    The algorithms are warmed up once, then every (algorithm, k) is timed
+    in an untraced pass (workers processes) and finally probed in a
+    single traced pass (memory_workers processes), which starts
+    tracemalloc once per process. The tracer never runs during a timed
+    call.
+
+    Returns (time_results, memory_results) in the same format as
+    run_time_benchmarks and run_memory_benchmarks.
+    """
+    if workers is None:
+        workers = WORKERS
+    if memory_workers is None:
+        memory_workers = MEMORY_WORKERS
+    time_results = {algo_name: {} for algo_name in ALGORITHMS}
+    memory_results = {algo_name: {} for algo_name in ALGORITHMS}
+    
+    print("\n" + "="*60)
+    print("TIME + MEMORY BENCHMARK - FUZZY MATCHING ALGORITHMS")
+    print("="*60)
+    print(f"Text size (T): {len(text):,} bases")
+    print(f"Pattern length (P): {len(pattern)} bases")
+    print(f"Pattern: {pattern}")
+    print(f"Edit distances (k): {k_values}")
+    print(f"Worker processes: {workers} (time), {memory_workers} (memory)")
+    print("="*60)
+    
+    print("\nWarming up...")
+    _warm_up(text, pattern)
+    
+    jobs = [(algo_name, k) for k in k_values for algo_name in ALGORITHMS]
+    total = len(ALGORITHMS)
+    
+    # Pass 1: time everything with tracemalloc off
+    print("\nTiming (untraced):")
+    for index, ((algo_name, k), outcome) in enumerate(_run_jobs(_time_job, jobs, text, pattern, workers)):
+        step = index % total + 1
+        if step == 1:
+            print(f"\nEdit distance k = {k}:")
+        print(f"  [{step}/{total}] {algo_name}...")
         
-        # Damerau-Levenshtein
-        print(f"  [2/3] Measuring Damerau-Levenshtein memory...")
-        try:
-            mem = benchmark_memory_damerau(text, pattern, k)
-            results['Damerau-Levenshtein'][k] = mem
-            print(f"        Memory: {mem:,} bytes ({mem/(1024*1024):.2f} MB)")
-        except Exception as e:
-            print(f"        ERROR: {e}")
-            results['Damerau-Levenshtein'][k] = None
+        if isinstance(outcome, Exception):
+            print(f"        ERROR: {outcome}")
+            time_results[algo_name][k] = None
+        else:
+            elapsed, num_matches = outcome
+            time_results[algo_name][k] = elapsed
+            print(f"        Time: {elapsed:.4f}s, Matches: {num_matches}")
+    
+    # Pass 2: one traced pass for the peaks. Serial runs trace in this
+    # process; pool workers start tracing in _ensure_tracing
+    trace_here = memory_workers <= 1 and MEMORY_PROBE == 'tracemalloc' and not tracemalloc.is_tracing()
+    if trace_here:
+        tracemalloc.start()
+    
+    print("\nMemory (traced):")
+    for index, ((algo_name, k), outcome) in enumerate(_run_jobs(_memory_job, jobs, text, pattern, memory_workers)):
+        step = index % total + 1
+        if step == 1:
+            print(f"\nEdit distance k = {k}:")
+        print(f"  [{step}/{total}] {algo_name} memory...")
         
-        # Shift-Or
-        print(f"  [3/3] Measuring Shift-Or memory...")
-        try:
-            mem = benchmark_memory_shift_or(text, pattern, k)
-            results['Shift-Or'][k] = mem
+        if isinstance(outcome, Exception):
+            print(f"        ERROR: {outcome}")
+            memory_results[algo_name][k] = None
+        else:
+            mem = outcome
+            memory_results[algo_name][k] = mem
             print(f"        Memory: {mem:,} bytes ({mem/(1024*1024):.2f} MB)")
-        except Exception as e:
-            print(f"        ERROR: {e}")
-            results['Shift-Or'][k] = None
     
-    return results
+    if trace_here:
+        tracemalloc.stop()
+
+    return time_results, memory_results
 
 
 # =============================================================================
@@ -253,9 +396,12 @@ def plot_results(time_results, memory_results):
     """Create two plots: Time vs k, and Memory vs k."""
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
     
+    # Same k grid for every algorithm: sort it once
+    all_k = sorted(next(iter(time_results.values())))
+    
     # Plot 1: Time vs Edit Distance
     for algo_name, measurements in time_results.items():
-        k_values = sorted([k for k in measurements.keys() if measurements[k] is not None])
+        k_values = [k for k in all_k if measurements.get(k) is not None]
         times = [measurements[k] for k in k_values]
         
         ax1.plot(k_values, times, marker='o', label=algo_name, linewidth=2, markersize=8)
@@ -265,11 +411,11 @@ def plot_results(time_results, memory_results):
     ax1.set_title('Time vs Edit Distance\n(T=100K bases, P=20 bases)', fontsize=13, fontweight='bold')
     ax1.legend(fontsize=10, loc='best')
     ax1.grid(True, alpha=0.3)
-    ax1.set_xticks(sorted(time_results[list(time_results.keys())[0]].keys()))
+    ax1.set_xticks(all_k)
     
     # Plot 2: Memory vs Edit Distance
     for algo_name, measurements in memory_results.items():
-        k_values = sorted([k for k in measurements.keys() if measurements[k] is not None])
+        k_values = [k for k in all_k if measurements.get(k) is not None]
         memory = [measurements[k] for k in k_values]
         
         ax2.plot(k_values, memory, marker='o', label=algo_name, linewidth=2, markersize=8)
@@ -279,7 +425,7 @@ def plot_results(time_results, memory_results):
     ax2.set_title('Memory vs Edit Distance\n(T=100K bases, P=20 bases)', fontsize=13, fontweight='bold')
     ax2.legend(fontsize=10, loc='best')
     ax2.grid(True, alpha=0.3)
-    ax2.set_xticks(sorted(memory_results[list(memory_results.keys())[0]].keys()))
+    ax2.set_xticks(all_k)
     ax2.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
     
     plt.suptitle('Fuzzy Matching Algorithm Comparison', fontsize=14, fontweight='bold', y=1.00)
@@ -324,8 +470,11 @@ def main():
     print(f"  Edit distance (k): {k_values}")
     
     # Run benchmarks
-    time_results = run_time_benchmarks(text, pattern, k_values)
-    memory_results = run_memory_benchmarks(text, pattern, k_values)
+    if COMBINED:
+        time_results, memory_results = run_combined_benchmarks(text, pattern, k_values)
+    else:
+        time_results = run_time_benchmarks(text, pattern, k_values)
+        memory_results = run_memory_benchmarks(text, pattern, k_values)
     
     # Plot results
     print("\nGenerating plots...")
@@ -1,19 +1,27 @@
-def build_bad_character_table(pattern: str) -> dict:
+import functools
+
+from sequence_utils import encode_pair, find_all_native, memoise_bytes
+
+
+def build_bad_character_table(pattern, sigma: int = 256) -> list:
     """
     Preprocess the pattern for the Bad Character heuristic.
 
-    For each character, store the LAST index it appears at in the pattern.
+    For each character code, store the LAST index it appears at in the
+    pattern (-1 if it does not occur). The pattern is given as integer
+    codes (see sequence_utils.encode_pair), so the table is a flat list
+    indexed by code instead of a dict keyed by character.
 
     Example:
-        pattern = "ABAB"
-        bad_char['A'] = 2
-        bad_char['B'] = 3
+        pattern = b"ABAB"
+        bad_char[ord('A')] = 2
+        bad_char[ord('B')] = 3
 
-    Complexity: O(m)
+    Complexity: O(m + sigma)
     """
-    table = {}
-    for i, ch in enumerate(pattern):
-        table[ch] = i   # last occurrence index
+    table = [-1] * sigma
+    for i, code in enumerate(pattern):
+        table[code] = i   # last occurrence index
     return table
 
 
@@ -57,14 +65,13 @@ def build_good_suffix_table(pattern: str) -> list:
     shift = [m] * m
     suffix = build_suffixes(pattern)
 
-    # Case 1: suffix matches a suffix of pattern
+    # Case 1: suffix matches a suffix of pattern. j only moves forward,
+    # so every entry is still m when reached and is filled as a slice
     j = 0
     for i in range(m-1, -1, -1):
-        if suffix[i] == i+1:
-            while j < m-1-i:
-                if shift[j] == m:
-                    shift[j] = m-1-i
-                j += 1
+        if suffix[i] == i+1 and j < m-1-i:
+            shift[j:m-1-i] = [m-1-i] * (m-1-i-j)
+            j = m-1-i
 
     # Case 2: substring inside pattern
     for i in range(m-1):
@@ -72,12 +79,47 @@ def build_good_suffix_table(pattern: str) -> list:
     return shift
 
 
+@memoise_bytes
+def _bm_tables(pat, sigma: int) -> tuple:
+    """
+    (bad character, good suffix) tables of the encoded pattern.
+
+    The bad character table is sized by the code alphabet, the good
+    suffix table by the pattern; both are returned as tuples.
+    """
+    return (tuple(build_bad_character_table(pat, sigma)),
+            tuple(build_good_suffix_table(pat)))
+
+
 def boyer_moore_search(text: str, pattern: str) -> list:
+    """
+    Find all occurrences of pattern in text (production path).
+
+    Delegates to sequence_utils.find_all_native; the textbook Boyer–Moore
+    implementation is boyer_moore_search_pedagogical.
+
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+
+    Returns
+    -------
+    list
+        Starting indices of all occurrences of pattern in text.
+    """
+    return find_all_native(text, pattern)
+
+
+def boyer_moore_search_pedagogical(text: str, pattern: str) -> list:
     """
     Full Boyer–Moore exact pattern matching algorithm.
 
     Uses BOTH:
-        - Bad Character heuristic
+        - Bad Character heuristic (Sunday's variant, on the character
+          just past the window)
         - Good Suffix heuristic
 
     Parameters
@@ -97,33 +139,109 @@ def boyer_moore_search(text: str, pattern: str) -> list:
     if m == 0:
         return list(range(n+1))
 
-    bad = build_bad_character_table(pattern)
-    good = build_good_suffix_table(pattern)
+    # Integer codes: compares and table lookups avoid 1-char str objects
+    txt, pat, sigma = encode_pair(text, pattern)
+
+    bad, good = _bm_tables(pat, sigma)
+
+    # Short patterns get a scan with the compare loop unrolled
+    scan = _make_bm_scan(m) if m <= _UNROLL_LIMIT else _bm_scan
+    return scan(txt, pat, bad, good)
+
+
+def _bm_scan(txt, pat, bad, good) -> list:
+    """
+    Boyer–Moore scan over encoded text, given the prebuilt tables.
+
+    Kept separate from boyer_moore_search so the hot loop only touches
+    locals: the bounds, the two tables and the encoded sequences.
+    """
+    n, m = len(txt), len(pat)
+    last = n - m
+    full_shift = good[0]
 
     matches = []
     s = 0  # shift
 
-    while s <= n - m:
+    # Every alignment but the last has a character past the window for
+    # the Sunday lookup; the last one is checked after the loop
+    while s < last:
         j = m - 1
 
         # compare from right to left
-        while j >= 0 and pattern[j] == text[s + j]:
+        while j >= 0 and pat[j] == txt[s + j]:
             j -= 1
 
         if j < 0:
             matches.append(s)
-            s += good[0]  # full match shift
+            shift = full_shift  # full match shift
         else:
-            # bad character shift
-            bc_shift = j - bad.get(text[s + j], -1)
-            # good suffix shift
-            gs_shift = good[j]
+            shift = good[j]     # good suffix shift
 
-            s += max(bc_shift, gs_shift)
+        # Bad character shift, Sunday style: instead of the mismatched
+        # character, look at the character just past the window. The
+        # next alignment must match it too, so the pattern can jump to
+        # that character's last occurrence (m + 1 if it has none). On
+        # DNA this skips further than the classic rule at the same cost.
+        sd_shift = m - bad[txt[s + m]]
+        if sd_shift > shift:
+            shift = sd_shift
+
+        s += shift
+
+    if s == last and txt[last:] == pat:
+        matches.append(last)
 
     return matches
 
 
+# Longest pattern that gets a generated, unrolled scan
+_UNROLL_LIMIT = 32
+
+
+@functools.lru_cache(maxsize=None)
+def _make_bm_scan(m):
+    """
+    Generate the Boyer–Moore scan specialised for pattern length m.
+
+    The right-to-left compare is unrolled into an if/elif chain over
+    j = m-1 .. 0: the pattern codes and good-suffix shifts are unpacked
+    into locals p0..p{m-1} and g0..g{m-1} once, so each alignment runs
+    no inner while loop and no pattern or table indexing. Built once
+    per m.
+
+    The generated scan(txt, pat, bad, good) equals
+    _bm_scan(txt, pat, bad, good) for len(pat) == m.
+    """
+    pats = ', '.join(f'p{j}' for j in range(m))
+    goods = ', '.join(f'g{j}' for j in range(m))
+    src = ['def scan(txt, pat, bad, good):',
+           f'    {pats}, = pat',
+           f'    {goods}, = good',
+           f'    last = len(txt) - {m}',
+           '    matches = []',
+           '    s = 0',
+           '    while s < last:']
+    for j in range(m - 1, -1, -1):
+        keyword = 'if' if j == m - 1 else 'elif'
+        src += [f'        {keyword} txt[s + {j}] != p{j}:',
+                f'            shift = g{j}']
+    src += ['        else:',
+            '            matches.append(s)',
+            '            shift = g0',
+            f'        sd_shift = {m} - bad[txt[s + {m}]]',
+            '        if sd_shift > shift:',
+            '            shift = sd_shift',
+            '        s += shift',
+            '    if s == last and txt[last:] == pat:',
+            '        matches.append(last)',
+            '    return matches']
+
+    namespace = {}
+    exec('\n'.join(src), namespace)
+    return namespace['scan']
+
+
 if __name__ == '__main__':
     print("Boyer-Moore Pattern Matching Algorithm")
     print("=" * 50)
@@ -131,7 +249,7 @@ if __name__ == '__main__':
     text = input("Enter text: ")
     pattern = input("Enter pattern to search: ")
     
-    matches = boyer_moore_search(text, pattern)
+    matches = boyer_moore_search_pedagogical(text, pattern)
     
     print(f"\nPattern '{pattern}' found at positions: {matches}")
     print(f"Total matches: {len(matches)}")
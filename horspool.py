@@ -1,4 +1,7 @@
-def build_shift_table(pattern: str) -> dict:
+from sequence_utils import encode_pair, find_all_native, memoise_bytes
+
+
+def build_shift_table(pattern, sigma: int = 256) -> list:
     """
     Builds the shift table used by Horspool's algorithm.
 
@@ -11,22 +14,59 @@ def build_shift_table(pattern: str) -> dict:
 
     Last character is special: default shift = pattern length.
 
+    The pattern is given as integer codes (see sequence_utils.encode_pair),
+    so the table is a flat list indexed by code.
+
     Returns
     -------
-    dict(char → int)
+    list(code → int)
         Bad character shift values.
     """
     m = len(pattern)
-    table = {ch: m for ch in set(pattern)}  # default shift = m
+    table = [m] * sigma  # default shift = m
 
-    # Fill all but last character
-    for i in range(m - 1):
-        table[pattern[i]] = m - 1 - i
+    # Fill all but last character in one pass: pattern[i] gets
+    # m - 1 - i, so the shifts simply count down from m - 1 to 1
+    for code, dist in zip(pattern[:m - 1], range(m - 1, 0, -1)):
+        table[code] = dist
 
     return table
 
 
+@memoise_bytes
+def _shift_table(pat, sigma: int) -> tuple:
+    """
+    Horspool shift table of the encoded pattern, as a tuple.
+
+    Only the m-1 codes of the pattern get a shift below m, so for a
+    256-code alphabet most of the table is the default.
+    """
+    return tuple(build_shift_table(pat, sigma))
+
+
 def horspool_search(text: str, pattern: str) -> list:
+    """
+    Find all occurrences of pattern in text (production path).
+
+    Delegates to sequence_utils.find_all_native; the textbook Horspool
+    implementation is horspool_search_pedagogical.
+
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+
+    Returns
+    -------
+    list
+        Starting indices of all occurrences of pattern in text.
+    """
+    return find_all_native(text, pattern)
+
+
+def horspool_search_pedagogical(text: str, pattern: str) -> list:
     """
     Horspool string matching algorithm.
 
@@ -54,24 +94,43 @@ def horspool_search(text: str, pattern: str) -> list:
     if m == 0:
         return list(range(n + 1))
 
-    shift = build_shift_table(pattern)
-    matches = []
+    # Integer codes: compares and table lookups avoid 1-char str objects
+    txt, pat, sigma = encode_pair(text, pattern)
+
+    shift = _shift_table(pat, sigma)
+    return _horspool_scan(txt, pat, shift)
 
+
+def _horspool_scan(txt, pat, shift) -> list:
+    """
+    Horspool scan over encoded text, given the prebuilt shift table.
+
+    The text character under the last pattern position is loaded once
+    per alignment, and serves both as the first compare and as the
+    shift key.
+    """
+    n, m = len(txt), len(pat)
+    last = n - m
+    tail = pat[m - 1]
+
+    matches = []
     i = 0  # alignment index in text
 
-    while i <= n - m:
-        # compare pattern backwards
-        j = m - 1
-        while j >= 0 and pattern[j] == text[i + j]:
-            j -= 1
+    while i <= last:
+        c = txt[i + m - 1]
+        if c == tail:
+            # compare the rest of the pattern backwards
+            j = m - 2
+            while j >= 0 and pat[j] == txt[i + j]:
+                j -= 1
+
+            if j < 0:
+                matches.append(i)
+                i += m  # full match shift
+                continue
 
-        if j < 0:
-            matches.append(i)
-            i += m  # full match shift
-        else:
-            # get text character causing mismatch
-            char = text[i + m - 1]
-            i += shift.get(char, m)  # default m if char not in table
+        # shift by the text character under the last pattern position
+        i += shift[c]
 
     return matches
 
@@ -83,7 +142,7 @@ if __name__ == '__main__':
     text = input("Enter text: ")
     pattern = input("Enter pattern to search: ")
     
-    matches = horspool_search(text, pattern)
+    matches = horspool_search_pedagogical(text, pattern)
     
     print(f"\nPattern '{pattern}' found at positions: {matches}")
     print(f"Total matches: {len(matches)}")
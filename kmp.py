@@ -1,3 +1,6 @@
+from sequence_utils import encode_pair, find_all_native, memoise_bytes
+
+
 def compute_lps(pattern: str) -> list:
     """
     Constructs the LPS (Longest Proper Prefix which is also Suffix) array.
@@ -7,7 +10,7 @@ def compute_lps(pattern: str) -> list:
 
     Parameters
     ----------
-    pattern : str
+    pattern : str or bytes
         The pattern whose LPS table we are building.
 
     Returns
@@ -36,7 +39,35 @@ def compute_lps(pattern: str) -> list:
     return lps
 
 
+@memoise_bytes
+def _lps_table(pat) -> tuple:
+    """LPS table of the encoded pattern, as a tuple."""
+    return tuple(compute_lps(pat))
+
+
 def kmp_search(text: str, pattern: str) -> list:
+    """
+    Find all occurrences of pattern in text (production path).
+
+    Delegates to sequence_utils.find_all_native; the textbook KMP
+    implementation is kmp_search_pedagogical.
+
+    Parameters
+    ----------
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+
+    Returns
+    -------
+    list
+        Starting indices of all occurrences of pattern in text.
+    """
+    return find_all_native(text, pattern)
+
+
+def kmp_search_pedagogical(text: str, pattern: str) -> list:
     """
     Performs KMP exact string matching on text.
 
@@ -60,32 +91,40 @@ def kmp_search(text: str, pattern: str) -> list:
     - No backtracking in text.
     """
 
-    if pattern == "":
+    if not pattern:
         return list(range(len(text) + 1))  # every position matches
 
-    matches = []
-    lps = compute_lps(pattern)
+    # Integer codes: compares avoid 1-char str objects
+    txt, pat, _ = encode_pair(text, pattern)
+
+    lps = _lps_table(pat)
+    return _kmp_scan(txt, pat, lps)
+
+
+def _kmp_scan(txt, pat, lps) -> list:
+    """
+    KMP scan over encoded text, given the LPS table.
 
-    i = 0   # index on text
+    The text pointer only ever moves forward, so it is the loop
+    variable of a plain for loop; only the pattern pointer j falls back.
+    """
+    m = len(pat)
+    matches = []
     j = 0   # index on pattern
 
-    while i < len(text):
-        if text[i] == pattern[j]:
-            i += 1
+    for i, c in enumerate(txt):
+        # fallback using LPS array until c extends the matched prefix
+        while j and c != pat[j]:
+            j = lps[j - 1]
+
+        if c == pat[j]:
             j += 1
 
-            if j == len(pattern):
+            if j == m:
                 # Pattern found!
-                matches.append(i - j)
+                matches.append(i - m + 1)
                 j = lps[j - 1]  # continue searching next possible match
 
-        else:
-            if j != 0:
-                # fallback using LPS array
-                j = lps[j - 1]
-            else:
-                i += 1  # move text pointer only
-
     return matches
 
 
@@ -96,7 +135,7 @@ if __name__ == '__main__':
     text = input("Enter text: ")
     pattern = input("Enter pattern to search: ")
     
-    matches = kmp_search(text, pattern)
+    matches = kmp_search_pedagogical(text, pattern)
     
     print(f"\nPattern '{pattern}' found at positions: {matches}")
     print(f"Total matches: {len(matches)}")
@@ -1,6 +1,13 @@
+import functools
 import re
 from typing import List, Tuple, Optional, Pattern
 
+# Optional Hyperscan backend for regex_search (opt-in, see regex_search)
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 
 class DNARegex:
     """
@@ -65,29 +72,83 @@ class DNARegex:
         return re.compile(pattern)
 
 
-def regex_search(text: str, pattern: str) -> list:
+@functools.lru_cache(maxsize=1024)
+def _hyperscan_literal(pattern: str):
+    """Compile the escaped literal into a Hyperscan block-mode database once."""
+    db = hyperscan.Database()
+    db.compile(expressions=[re.escape(pattern).encode('ascii')], ids=[0], flags=[0])
+    return db
+
+
+def _hyperscan_search(text: str, pattern: str) -> list:
+    """
+    Literal search with Hyperscan, with re.finditer semantics.
+
+    Hyperscan reports the end offset of every occurrence, overlapping
+    ones included. For a literal the start is end - m, and keeping the
+    occurrences that begin at or after the end of the previous kept one
+    reproduces the leftmost, non-overlapping matches of re.finditer.
+    """
+    m = len(pattern)
+    ends = []
+
+    def on_match(match_id, start, end, flags, context):
+        ends.append(end)
+
+    _hyperscan_literal(pattern).scan(text.encode('ascii'), match_event_handler=on_match)
+
+    matches = []
+    next_free = 0
+    for end in ends:
+        start = end - m
+        if start >= next_free:
+            matches.append(start)
+            next_free = end
+    return matches
+
+
+def regex_search(text: str, pattern: str, use_hyperscan: bool = False) -> list:
     """
-    Search for exact pattern matches in text using Python's regex engine.
+    Search for exact pattern matches in text.
+
+    The pattern is matched literally (as re.finditer(re.escape(pattern))
+    would), so no regex engine is needed: the occurrences are found
+    with str.find, which runs CPython's compiled string search and
+    skips pattern compilation and match-object creation. Use DNARegex
+    for real regular expressions.
+
+    Hyperscan is opt-in: it has only been measured against re, not
+    against str.find, and it needs an ASCII copy of the text plus one
+    Python callback per occurrence.
     
     Parameters
     ----------
     text : str
         The text to search in.
     pattern : str
-        The pattern to search for (will be escaped for literal matching).
+        The pattern to search for (matched literally).
+    use_hyperscan : bool, optional
+        Run ASCII searches with Hyperscan, if the optional hyperscan
+        package is installed (default False).
     
     Returns
     -------
     list
-        Starting indices of all matches.
+        Starting indices of all leftmost non-overlapping matches.
     """
-    # Escape pattern for literal matching
-    escaped_pattern = re.escape(pattern)
+    if (use_hyperscan and hyperscan is not None and pattern
+            and text.isascii() and pattern.isascii()):
+        return _hyperscan_search(text, pattern)
+
+    # Continue after each match, like finditer; an empty pattern
+    # matches at every position 0..n
+    step = len(pattern) or 1
     
-    # Find all matches
     matches = []
-    for match in re.finditer(escaped_pattern, text):
-        matches.append(match.start())
+    i = text.find(pattern)
+    while i >= 0:
+        matches.append(i)
+        i = text.find(pattern, i + step)
     
     return matches
 
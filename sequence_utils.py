@@ -0,0 +1,309 @@
+import functools
+import gc
+import importlib.util
+import os
+from contextlib import contextmanager
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+
+class _AbsentCodes(dict):
+    """Translation table that sends every unknown character to code 0."""
+    def __missing__(self, key):
+        return 0
+
+
+def encode_pair(text, pattern):
+    """
+    Encode text and pattern as integer sequences with consistent codes.
+
+    Indexing a str yields a 1-character str object; indexing bytes yields
+    a small int, so every comparison in the hot loops becomes a C-level
+    int compare.
+
+    ASCII input (the DNA case) is encoded directly, so codes are the
+    character ordinals and fit a 256-entry table.
+    Other input is compacted: pattern characters are numbered from 1 and
+    every character that does not occur in the pattern becomes 0.
+    This is safe because the algorithms only ever compare text
+    characters against pattern characters.
+
+    Parameters
+    ----------
+    text : str or bytes
+        The text (or second string).
+    pattern : str or bytes
+        The pattern (or first string).
+
+    Returns
+    -------
+    tuple
+        (text_codes, pattern_codes, sigma) where sigma is the size of
+        the code alphabet, i.e. every code is in range(sigma).
+    """
+    if isinstance(text, (bytes, bytearray)) and isinstance(pattern, (bytes, bytearray)):
+        return text, pattern, 256
+
+    if text.isascii() and pattern.isascii():
+        return text.encode('ascii'), pattern.encode('ascii'), 256
+
+    codes = _AbsentCodes()
+    for ch in pattern:
+        if ord(ch) not in codes:
+            codes[ord(ch)] = len(codes) + 1
+    sigma = len(codes) + 1
+
+    text_t = text.translate(codes)
+    pattern_t = pattern.translate(codes)
+    if sigma <= 256:
+        return text_t.encode('latin-1'), pattern_t.encode('latin-1'), sigma
+
+    # Huge pattern alphabet: fall back to 32-bit code arrays
+    return (array('I', map(ord, text_t)),
+            array('I', map(ord, pattern_t)),
+            sigma)
+
+
+def encode_alphabet(text):
+    """
+    Number the characters of text 0..sigma-1 (sorted) and return
+    (slot, table, codes): the char -> code mapping, its str.translate
+    table (None for sigma > 256) and the text as codes, as bytes when
+    sigma <= 256 so every index and compare is on ints.
+
+    Unlike encode_pair, the codes are dense, so a suffix tree node can
+    keep one child slot per character of the text (4 slots for DNA).
+    """
+    slot = {ch: code for code, ch in enumerate(sorted(set(text)))}
+    if len(slot) <= 256:
+        table = {ord(ch): code for ch, code in slot.items()}
+        return slot, table, text.translate(table).encode('latin-1')
+    return slot, None, [slot[ch] for ch in text]
+
+
+# Largest alphabet that gets a flat child table in the suffix trees;
+# larger alphabets use an AbsentChildren dict, which only stores the
+# edges that exist
+TABLE_SIGMA = 16
+
+
+class AbsentChildren(dict):
+    """Child dict that reports every missing child as `absent`."""
+    __slots__ = ()
+    absent = None
+
+    def __missing__(self, key):
+        return self.absent
+
+
+def find_all_native(text, pattern) -> list:
+    """
+    All (overlapping) occurrences of pattern in text via str.find.
+
+    str.find / bytes.find run CPython's compiled search (memchr for a
+    single character, a Boyer–Moore–Horspool–Sunday hybrid otherwise),
+    so the whole scan happens in C and only the hits reach Python. This
+    beats any interpreted scan by a wide margin, which is why the
+    production kmp_search, boyer_moore_search and horspool_search all
+    delegate here.
+
+    Parameters
+    ----------
+    text : str or bytes
+        The text to search in.
+    pattern : str or bytes
+        The pattern to search for.
+
+    Returns
+    -------
+    list
+        Starting indices of all occurrences, in increasing order.
+    """
+    matches = []
+    i = text.find(pattern)
+    while i >= 0:
+        matches.append(i)
+        i = text.find(pattern, i + 1)
+    return matches
+
+
+def memoise_bytes(build):
+    """
+    Decorator: memoise the pattern table build(pat, *args) per pattern.
+
+    Patterns encoded as bytes (the usual case, see encode_pair) are
+    hashable and go through a bounded lru_cache, so repeated searches
+    for one pattern build its table once. Wide code arrays are not
+    hashable and are rare, so their table is built on every call.
+    Cached tables are shared between callers, so build must return an
+    immutable value (tuples).
+    """
+    cached = functools.lru_cache(maxsize=1024)(build)
+
+    @functools.wraps(build)
+    def table(pat, *args):
+        if isinstance(pat, bytes):
+            return cached(pat, *args)
+        return build(pat, *args)
+
+    table.cache_clear = cached.cache_clear
+    return table
+
+
+# Shortest pattern part worth filtering on. Parts of one or two
+# characters occur almost everywhere in DNA, so nearly every window
+# becomes a candidate and the filter only adds its own overhead on top
+# of the full scan.
+_MIN_PIECE = 3
+
+
+def candidate_windows(txt, pat, pieces: int, slack: int):
+    """
+    Pigeonhole filter for sliding-window approximate matching.
+
+    The pattern is cut into `pieces` non-overlapping parts. A window
+    within distance k of the pattern has at most k parts spoiled by
+    edits (2k for Damerau-Levenshtein, as one transposition can
+    straddle two parts). With more parts than that, at least one part
+    occurs verbatim in the window, shifted by at most `slack`
+    positions from where it sits in the pattern. Occurrences of the
+    parts are located with bytes.find (C-level), so the caller only
+    needs to verify windows near an occurrence.
+
+    Parameters
+    ----------
+    txt : bytes
+        Encoded text (see encode_pair).
+    pat : bytes
+        Encoded pattern.
+    pieces : int
+        Number of parts to cut the pattern into.
+    slack : int
+        Maximum shift of a part inside a matching window.
+
+    Returns
+    -------
+    range or list
+        Window start positions that may match, in increasing order.
+        When the filter does not apply (parts shorter than _MIN_PIECE,
+        or non-bytes text), every window is returned.
+    """
+    n, m = len(txt), len(pat)
+    last = n - m
+    if last < 0:
+        return range(0)
+    if m // pieces < _MIN_PIECE or isinstance(txt, array):
+        return range(last + 1)
+
+    mask = bytearray(last + 1)
+    ones = b'\x01' * (2 * slack + 1)
+
+    for t in range(pieces):
+        p0 = t * m // pieces
+        piece = pat[p0:(t + 1) * m // pieces]
+
+        q = txt.find(piece)
+        while q >= 0:
+            lo = max(q - p0 - slack, 0)
+            hi = min(q - p0 + slack, last)
+            if lo <= hi:
+                mask[lo:hi + 1] = ones[:hi - lo + 1]
+            q = txt.find(piece, q + 1)
+
+    starts = []
+    i = mask.find(1)
+    while i >= 0:
+        starts.append(i)
+        i = mask.find(1, i + 1)
+    return starts
+
+
+@contextmanager
+def gc_paused():
+    """
+    Suspend the cyclic garbage collector for the duration of the block.
+
+    Building a suffix tree allocates hundreds of thousands of nodes and
+    never frees one, yet every few hundred allocations trigger a GC
+    pass that traverses the ever growing tree. Pausing the collector
+    removes that repeated traversal; reference counting still frees
+    garbage as usual. The previous collector state is restored.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+_worker_modules = {}
+
+
+def _match_chunk(job):
+    """
+    Worker for parallel_window_search.
+
+    The search function is shipped as (source file, name) and loaded
+    from its file, because module names such as the one of
+    Damerau–Levenshtein.py cannot be imported (and thus not pickled)
+    by name.
+    """
+    path, name, chunk, pattern, k, offset = job
+    module = _worker_modules.get(path)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            f'_window_worker_{len(_worker_modules)}', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _worker_modules[path] = module
+    find = getattr(module, name)
+    return [offset + i for i in find(chunk, pattern, k)]
+
+
+def parallel_window_search(find, text, pattern, k, nproc=None):
+    """
+    Run a sliding-window matcher find(text, pattern, k) over nproc
+    processes.
+
+    Window starts are split into contiguous blocks; each block is
+    matched on its own text slice, which overlaps the next one by
+    m-1 characters so its last window is complete.
+
+    Parameters
+    ----------
+    find : function
+        Module-level matcher returning window start positions.
+    text : str
+        The text to search in.
+    pattern : str
+        The pattern to search for.
+    k : int
+        Maximum allowed edit distance.
+    nproc : int, optional
+        Number of worker processes (default: os.cpu_count()).
+
+    Returns
+    -------
+    list
+        Starting indices returned by find, in increasing order.
+    """
+    if nproc is None:
+        nproc = os.cpu_count() or 1
+
+    m = len(pattern)
+    windows = len(text) - m + 1
+    if nproc <= 1 or windows <= nproc:
+        return find(text, pattern, k)
+
+    chunk_size = (windows + nproc - 1) // nproc
+    path, name = find.__code__.co_filename, find.__name__
+    jobs = [
+        (path, name, text[start:start + chunk_size + m - 1], pattern, k, start)
+        for start in range(0, windows, chunk_size)
+    ]
+
+    with ProcessPoolExecutor(max_workers=nproc) as executor:
+        parts = executor.map(_match_chunk, jobs)
+        return [i for part in parts for i in part]
@@ -1,6 +1,21 @@
+from sequence_utils import encode_pair, memoise_bytes
+
+
+@memoise_bytes
+def _char_masks(pat, sigma: int) -> tuple:
+    """
+    Shift-AND masks of an encoded pattern: bit i of entry c is set iff
+    pattern[i] == c, as a tuple.
+    """
+    char_masks = [0] * sigma
+    for i, c in enumerate(pat):
+        char_masks[c] |= (1 << i)
+    return tuple(char_masks)
+
+
 def shift_or_approx(text: str, pattern: str, k: int):
     """
-    Bit-parallel approximate matching using Shift-Or algorithm.
+    Bit-parallel approximate matching (Wu–Manber, Shift-AND form).
 
     Finds all positions where pattern matches text
     with at most k edit operations.
@@ -10,68 +25,72 @@ def shift_or_approx(text: str, pattern: str, k: int):
         - Deletion
         - Substitution
 
-    Uses bit masks and bit-parallel DP.
+    State vector R[j] is an NFA over the pattern: bit i of R[j] is set
+    iff pattern[0..i] matches a substring of the text ending at the
+    current character with at most j edits. With B[c] the mask of
+    positions where c occurs in the pattern, one text character updates
+
+        R'[0] = ((R[0] << 1) | 1) & B[c]
+        R'[j] = ((R[j] << 1) | 1) & B[c]                 match
+                | R[j-1]                                 insertion
+                | ((R[j-1] | R'[j-1]) << 1) | 1          substitution / deletion
+
+    and an occurrence ends at the current character when bit m-1 of
+    R[k] is set.
 
     Time:  O(n*k)
-    Space: O(|Σ|*k)
+    Space: O(|Σ| + k)
 
     Returns
     -------
-    list of indices where edit distance <= k
+    list of start indices i - m + 1 for every text index i at which an
+    occurrence with edit distance <= k ends
     """
 
     n, m = len(text), len(pattern)
     if m == 0:
         return list(range(n+1))
     
-    if m > 31:
-        raise ValueError("Pattern too long for bit-parallel algorithm (max 31 characters)")
-
-    # Build bit masks for each character
-    char_masks = {}
-    for c in set(text + pattern):
-        mask = 0
-        for i in range(m):
-            if i < len(pattern) and pattern[i] == c:
-                mask |= (1 << i)
-        char_masks[c] = mask
-
-    # Initialize state vectors for each error level
-    # R[j] represents matches with at most j errors
-    R = [0] * (k + 1)
-    R[0] = 1  # exact match state initialized
+    if m > 63:
+        raise ValueError("Pattern too long for bit-parallel algorithm (max 63 characters)")
+
+    # Integer codes, so the masks are a flat list indexed by code
+    txt, pat, sigma = encode_pair(text, pattern)
+
+    # Bit masks for each character code (cached per pattern)
+    char_masks = _char_masks(pat, sigma)
+
+    full = (1 << m) - 1
+    accept = 1 << (m - 1)
+
+    # Initial states: with j errors the first j pattern characters can
+    # be deleted before anything is read.
+    # R is updated in place. Level j only needs the old value of level
+    # j-1, which is carried in prev_old, so no second buffer or
+    # per-character copy of R is needed.
+    R = [(1 << j) - 1 for j in range(k + 1)]
     
     matches = []
     
-    for i, ch in enumerate(text):
+    for i, ch in enumerate(txt):
         # Get character mask
-        ch_mask = char_masks.get(ch, 0)
+        ch_mask = char_masks[ch]
         
-        # Update from highest error level to lowest
-        old_R = list(R)
+        # Exact level: extend matches by the current character
+        prev_old = R[0]
+        prev_new = R[0] = ((prev_old << 1) | 1) & ch_mask
         
-        for j in range(k, -1, -1):
-            # Shift (exact match continuation)
-            shifted = (old_R[j] << 1) & ch_mask
-            
-            # Add insertions, deletions, substitutions from lower error level
-            if j > 0:
-                # Insertion: don't consume pattern character
-                insertion = old_R[j-1]
-                # Deletion: consume pattern character but not text character  
-                deletion = (old_R[j-1] << 1)
-                # Substitution: consume both but they don't match
-                substitution = (old_R[j-1] << 1)
-                
-                R[j] = shifted | insertion | deletion | substitution
-            else:
-                R[j] = shifted
-            
-            # Always start fresh matches
-            R[j] |= 1
+        for j in range(1, k + 1):
+            cur_old = R[j]
+            prev_new = R[j] = (
+                (((cur_old << 1) | 1) & ch_mask)       # match
+                | prev_old                             # insertion
+                | (((prev_old | prev_new) << 1) | 1)   # substitution / deletion
+            ) & full
+            prev_old = cur_old
         
-        # Check if pattern fully matched at this position
-        if R[k] & (1 << (m)):
+        # Check if pattern fully matched ending at this position
+        if prev_new & accept and i >= m - 1:
             matches.append(i - m + 1)
     
     return matches
@@ -1,11 +1,24 @@
+from sequence_utils import TABLE_SIGMA, AbsentChildren, encode_alphabet, gc_paused
+
+
 class SuffixTreeNode:
     """
     A node in the suffix tree. 
     Each edge stores a substring (start, end) instead of single characters.
+
+    Children are kept in a fixed list with one slot per character of the
+    text's alphabet (4 slots for DNA) instead of a dict: descending an
+    edge is a list index instead of a hash lookup, and with __slots__ a
+    node is a small fixed-layout record. Beyond TABLE_SIGMA characters
+    the mostly empty slots would dominate memory, so the children go
+    into an AbsentChildren dict instead; both are indexed the same way.
     """
-    def __init__(self):
-        self.children = {}       # dict: char -> (start, end, SuffixTreeNode)
-        self.suffix_index = -1   # leaf nodes store starting position of suffix
+    __slots__ = ('children', 'suffix_index')
+
+    def __init__(self, sigma: int):
+        # slot -> (start, end, SuffixTreeNode)
+        self.children = [None] * sigma if sigma <= TABLE_SIGMA else AbsentChildren()
+        self.suffix_index = -1           # leaf nodes store starting position of suffix
 
 
 class NaiveSuffixTree:
@@ -19,8 +32,14 @@ class NaiveSuffixTree:
     """
 
     def __init__(self, text: str):
-        self.root = SuffixTreeNode()
         self.text = text
+
+        # Number the characters of the text 0..sigma-1 (sorted, so DNA
+        # gets A=0, C=1, G=2, T=3) and keep the text as slot codes
+        self.slot, _, self.codes = encode_alphabet(text)
+        self.sigma = len(self.slot)
+
+        self.root = SuffixTreeNode(self.sigma)
         self.build()
 
     def insert_suffix(self, suffix_start: int):
@@ -32,27 +51,34 @@ class NaiveSuffixTree:
         suffix_start : int
             Starting position of the suffix in the text.
         """
+        text = self.codes
+        sigma = self.sigma
+        n = len(text)
         node = self.root
         i = suffix_start  # current position in text
         
-        while i < len(self.text):
-            ch = self.text[i]
+        while i < n:
+            ch = text[i]
             
             # If no edge starts with this character, create new leaf
-            if ch not in node.children:
+            edge = node.children[ch]
+            if edge is None:
                 # Create leaf node with edge containing rest of suffix
-                leaf = SuffixTreeNode()
+                leaf = SuffixTreeNode(sigma)
                 leaf.suffix_index = suffix_start
-                node.children[ch] = (i, len(self.text) - 1, leaf)
+                node.children[ch] = (i, n - 1, leaf)
                 return
             
             # Edge exists, need to traverse or split
-            start, end, child = node.children[ch]
+            start, end, child = edge
             edge_len = end - start + 1
             
-            # Try to match along the edge
-            j = 0
-            while j < edge_len and i + j < len(self.text) and self.text[start + j] == self.text[i + j]:
+            # Try to match along the edge. The first character already
+            # matched by selecting the child slot, and the bound is taken
+            # once so the loop tests a single condition per character.
+            limit = edge_len if edge_len < n - i else n - i
+            j = 1
+            while j < limit and text[start + j] == text[i + j]:
                 j += 1
             
             # Full edge matched, continue to child
@@ -62,21 +88,21 @@ class NaiveSuffixTree:
             else:
                 # Partial match - need to split the edge
                 # Create internal node at split point
-                split_node = SuffixTreeNode()
+                split_node = SuffixTreeNode(sigma)
                 
                 # Update existing edge to go to split node (shortened)
                 node.children[ch] = (start, start + j - 1, split_node)
                 
                 # Add edge from split node to old child (remainder of old edge)
-                old_char = self.text[start + j]
+                old_char = text[start + j]
                 split_node.children[old_char] = (start + j, end, child)
                 
-                # Add new leaf for current suffix
-                new_char = self.text[i + j] if i + j < len(self.text) else None
-                if new_char:
-                    leaf = SuffixTreeNode()
+                # Add new leaf for current suffix (code 0 is a valid
+                # character, so test the position rather than the code)
+                if i + j < n:
+                    leaf = SuffixTreeNode(sigma)
                     leaf.suffix_index = suffix_start
-                    split_node.children[new_char] = (i + j, len(self.text) - 1, leaf)
+                    split_node.children[text[i + j]] = (i + j, n - 1, leaf)
                 else:
                     # Current suffix ends at split point
                     split_node.suffix_index = suffix_start
@@ -94,8 +120,11 @@ class NaiveSuffixTree:
             text = "banana$"
             Inserts suffixes at positions: 0,1,2,3,4,5,6
         """
-        for i in range(len(self.text)):
-            self.insert_suffix(i)
+        # All nodes stay alive until the tree is dropped, so collector
+        # passes during construction would only re-traverse the tree
+        with gc_paused():
+            for i in range(len(self.text)):
+                self.insert_suffix(i)
 
     def has_substring(self, pattern: str) -> bool:
         """
@@ -103,6 +132,13 @@ class NaiveSuffixTree:
 
         Complexity: O(m) where m = pattern length
         """
+        # A character that does not occur in the text cannot match
+        slot = self.slot
+        if any(ch not in slot for ch in pattern):
+            return False
+        pattern = [slot[ch] for ch in pattern]
+        text = self.codes
+
         node = self.root
         i = 0  # position in pattern
         
@@ -110,16 +146,17 @@ class NaiveSuffixTree:
             ch = pattern[i]
             
             # No edge starting with this character
-            if ch not in node.children:
+            edge = node.children[ch]
+            if edge is None:
                 return False
             
-            start, end, child = node.children[ch]
+            start, end, child = edge
             edge_len = end - start + 1
             
             # Match characters along the edge
             j = 0
             while j < edge_len and i < len(pattern):
-                if self.text[start + j] != pattern[i]:
+                if text[start + j] != pattern[i]:
                     return False
                 i += 1
                 j += 1
@@ -1,190 +1,438 @@
-class End:
-    """
-    Represents shared global end index for all leaves.
-    It allows O(1) update when extending leaves.
-    """
-    def __init__(self, value=0):
-        self.value = value
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
+from sequence_utils import TABLE_SIGMA, AbsentChildren, encode_alphabet
 
-class Node:
-    """
-    Node of a suffix tree in Ukkonen's algorithm.
+# Optional C suffix-array construction (SA-IS) for SuffixArray;
+# prefix doubling is used without it
+try:
+    import pydivsufsort
+except ImportError:
+    pydivsufsort = None
 
-    suffix_link -> link to another internal node for fast jumps.
-    children -> edges stored as character -> (start, End, Node)
-    """
-    def __init__(self):
-        self.children = {}
-        self.suffix_link = None
 
+class _AbsentNodes(AbsentChildren):
+    """Child dict that reports every missing child as -1 (no node)."""
+    __slots__ = ()
+    absent = -1
 
-class SuffixTree:
-    """
-    Ukkonen's linear-time suffix tree implementation. Construction is O(n).
 
-    The tree uses the original input string and stores edges as (start, end).
+def _build(codes, sigma):
     """
-    def __init__(self, text):
-        self.text = text
-        self.root = Node()
-
-        self.active_node = self.root
-        self.active_edge = -1
-        self.active_length = 0
-
-        self.remainder = 0       # number of pending suffixes
-        self.last_created_node = None
-
-        self.end = End(-1)       # global end
-
-        self.build()
-
-    # =========================================================================
-    # Helper functions
-    # =========================================================================
-
-    def edge_length(self, start, end):
-        return end.value - start + 1
-
-    def walk_down(self, start, end, nxt):
-        """Skip/Count trick."""
-        if self.active_length >= self.edge_length(start, end):
-            self.active_edge += self.edge_length(start, end)
-            self.active_length -= self.edge_length(start, end)
-            self.active_node = nxt
-            return True
-        return False
+    Ukkonen's construction over an integer-coded text.
+
+    The tree is stored as parallel 32-bit int arrays (array('i'))
+    indexed by node id instead of Node objects (struct of arrays): 4
+    bytes per entry, where a list would also keep a separate int object
+    for nearly every value. Every node except the root (id 0)
+    has exactly one incoming edge, so the edge is stored under the id
+    of the node it leads to:
+
+        start[v]        - text index of the first character on the edge into v
+        end[v]          - text index of its last character, or -1 for a
+                          leaf: all leaves share the global end, so one
+                          int replaces the shared End object
+        link[v]         - suffix link (internal nodes)
+        children[v*sigma + c] - child of v whose edge starts with code c,
+                          or -1
+
+    For small alphabets (DNA) the child table is a flat array with one
+    slot per character, so finding an edge is one index instead of
+    a search. Beyond TABLE_SIGMA characters the mostly empty slots
+    would dominate memory, so the same keys go into an _AbsentNodes
+    dict instead.
+    All state of the algorithm lives in locals, so the hot loop only
+    does array loads and stores on ints.
+
+    Parameters
+    ----------
+    codes : bytes or list
+        The text as integer character codes.
+    sigma : int
+        Alphabet size; every code is in range(sigma).
+
+    Returns
+    -------
+    tuple
+        (start, end, link, children)
+    """
+    start = array('i', [0])
+    end = array('i', [0])
+    link = array('i', [0])
+    if sigma <= TABLE_SIGMA:
+        children = array('i', [-1]) * sigma
+        no_children = array('i', [-1]) * sigma
+    else:
+        children = _AbsentNodes()
+        no_children = None
 
-    # =========================================================================
-    # Construction
-    # =========================================================================
+    active_node = 0
+    active_edge = 0
+    active_length = 0
+    remainder = 0       # number of pending suffixes
 
-    def extend(self, pos):
-        """
-        Handles extension for single phase (i)
-        Ukkonen extension rules are implemented here.
-        """
-        self.end.value += 1
-        self.remainder += 1
-        self.last_created_node = None
+    for pos, c in enumerate(codes):
+        remainder += 1
+        last_created_node = -1
 
-        while self.remainder > 0:
+        while remainder > 0:
 
-            if self.active_length == 0:
-                self.active_edge = pos
+            if active_length == 0:
+                active_edge = pos
 
-            ch = self.text[self.active_edge]
+            slot = active_node * sigma + codes[active_edge]
+            nxt = children[slot]
 
             # CASE 1: no edge starting with active_edge
-            if ch not in self.active_node.children:
+            if nxt < 0:
 
-                leaf = Node()
-                self.active_node.children[ch] = (pos, self.end, leaf)
+                leaf = len(start)
+                start.append(pos)
+                end.append(-1)
+                link.append(0)
+                if no_children:
+                    children += no_children
+                children[slot] = leaf
 
                 # RULE 2 extension
-                if self.last_created_node:
-                    self.last_created_node.suffix_link = self.active_node
-                    self.last_created_node = None
+                if last_created_node >= 0:
+                    link[last_created_node] = active_node
+                    last_created_node = -1
 
             else:
-                start, end, nxt = self.active_node.children[ch]
+                edge_start = start[nxt]
+                edge_end = end[nxt]
+                edge_length = (pos if edge_end < 0 else edge_end) - edge_start + 1
 
                 # Skip/Count trick
-                if self.walk_down(start, end, nxt):
+                if active_length >= edge_length:
+                    active_edge += edge_length
+                    active_length -= edge_length
+                    active_node = nxt
                     continue
 
                 # CASE 2: edge already contains next character
-                if self.text[start + self.active_length] == self.text[pos]:
-                    self.active_length += 1
+                split = edge_start + active_length
+                if codes[split] == c:
+                    active_length += 1
 
                     # RULE 3 (showstopper)
-                    if self.last_created_node:
-                        self.last_created_node.suffix_link = self.active_node
-                        self.last_created_node = None
+                    if last_created_node >= 0:
+                        link[last_created_node] = active_node
                     break
 
                 # CASE 3: split edge and create internal + leaf
-                split_end = End(start + self.active_length - 1)
-                internal = Node()
-
-                self.active_node.children[ch] = (start, split_end, internal)
-                internal.children[self.text[pos]] = (pos, self.end, Node())
-                nxt_start = start + self.active_length
-                nxt_char = self.text[nxt_start]
-                internal.children[nxt_char] = (nxt_start, end, nxt)
+                internal = len(start)
+                leaf = internal + 1
+                start.extend((edge_start, pos))
+                end.extend((split - 1, -1))
+                link.extend((0, 0))
+                if no_children:
+                    children += no_children
+                    children += no_children
+                children[slot] = internal
+                base = internal * sigma
+                children[base + c] = leaf
+                children[base + codes[split]] = nxt
+                start[nxt] = split
 
                 # suffix links
-                if self.last_created_node:
-                    self.last_created_node.suffix_link = internal
-                self.last_created_node = internal
+                if last_created_node >= 0:
+                    link[last_created_node] = internal
+                last_created_node = internal
 
-            self.remainder -= 1
+            remainder -= 1
 
-            # Active point update
-            if self.active_node == self.root and self.active_length > 0:
-                self.active_length -= 1
-                self.active_edge = pos - self.remainder + 1
+            # Active point update (the root links to itself)
+            if active_node == 0 and active_length > 0:
+                active_length -= 1
+                active_edge = pos - remainder + 1
             else:
-                self.active_node = (
-                    self.active_node.suffix_link
-                    if self.active_node.suffix_link
-                    else self.root
-                )
+                active_node = link[active_node]
+
+    return start, end, link, children
+
+
+def _encode_pattern(pattern, slot, table):
+    """
+    Encode pattern like encode_alphabet encoded the text, or return None
+    if it has a character the text lacks.
+    """
+    if not slot.keys() >= set(pattern):
+        return None
+    if table is not None:
+        return pattern.translate(table).encode('latin-1')
+    return [slot[ch] for ch in pattern]
+
+
+def _decode_text(slot, codes):
+    """Rebuild the text from the codes returned by encode_alphabet."""
+    chars = sorted(slot, key=slot.get)
+    if isinstance(codes, bytes):
+        return codes.decode('latin-1').translate(dict(enumerate(chars)))
+    return ''.join(chars[code] for code in codes)
+
+
+class SuffixTree:
+    """
+    Ukkonen's linear-time suffix tree implementation. Construction is O(n).
+
+    The text is kept as integer codes (one per distinct character) and the
+    tree as parallel int arrays built by _build; edges are stored as (start, end)
+    index pairs into the text.
+    """
+    # Length of the pattern prefixes whose descent has_substring memoises,
+    # and the maximum number of memoised prefixes
+    PREFIX_LENGTH = 8
+    PREFIX_CACHE_SIZE = 1 << 16
+
+    def __init__(self, text):
+        # Only the codes are kept; text is rebuilt from them on demand
+        self.slot, self.table, self.codes = encode_alphabet(text)
+        self.sigma = len(self.slot)
+
+        self.end = len(text) - 1     # global end of every leaf
+        self._prefix_cache = {}      # pattern prefix -> walk state
+        self.build()
+
+    @property
+    def text(self) -> str:
+        """The indexed text, decoded from the codes."""
+        return _decode_text(self.slot, self.codes)
+
+    @classmethod
+    def from_text_sa(cls, text):
+        """
+        Index text with a SuffixArray instead of a suffix tree.
+
+        For build-once, query-many use: the suffix array answers
+        has_substring in O(m log n) with about 5 bytes per character,
+        against tens of bytes per character for the tree.
+        """
+        return SuffixArray(text)
 
     def build(self):
         """Main Ukkonen loop."""
-        for i in range(len(self.text)):
-            self.extend(i)
+        self.start, self.edge_end, self.link, self.children = _build(self.codes, self.sigma)
 
     def has_substring(self, pattern: str) -> bool:
         """
         Search for a pattern in the suffix tree.
-        
+
         Parameters
         ----------
         pattern : str
             The pattern to search for.
-        
+
         Returns
         -------
         bool
             True if pattern exists in the text, False otherwise.
-        
+
         Complexity: O(m) where m is pattern length
         """
         if not pattern:
             return True
-        
-        node = self.root
-        i = 0  # position in pattern
-        
-        while i < len(pattern):
-            ch = pattern[i]
-            
-            # No edge starting with this character
-            if ch not in node.children:
-                return False
-            
-            start, end, child = node.children[ch]
-            
-            # Get actual end value
-            edge_end = end.value if isinstance(end, End) else end
-            edge_len = edge_end - start + 1
-            
-            # Match characters along the edge
-            j = 0
-            while j < edge_len and i < len(pattern):
-                if self.text[start + j] != pattern[i]:
-                    return False
-                i += 1
-                j += 1
-            
+
+        pat = _encode_pattern(pattern, self.slot, self.table)
+        if pat is None:
+            return False
+
+        # The walk state after the first PREFIX_LENGTH characters is
+        # memoised, so queries sharing a prefix skip its descent
+        key = pat[:self.PREFIX_LENGTH]
+        if not isinstance(key, bytes):
+            key = tuple(key)
+        cache = self._prefix_cache
+        state = cache.get(key, ())
+        if state == ():
+            state = self._walk(pat, 0, len(key), (0, 0, 0))
+            if len(cache) >= self.PREFIX_CACHE_SIZE:
+                del cache[next(iter(cache))]   # evict the oldest entry
+            cache[key] = state
+
+        if state is None:
+            return False
+        return self._walk(pat, len(key), len(pat), state) is not None
+
+    def _walk(self, pat, i, m, state):
+        """
+        Match pat[i:m] downwards from a walk state.
+
+        A state is (node, child, offset): offset characters of the edge
+        into child have been matched below node (offset 0 means the walk
+        stands on node itself). Returns the state after pat[m - 1], or
+        None if the characters do not occur.
+        """
+        text = self.codes
+        start, edge_end = self.start, self.edge_end
+        children, sigma = self.children, self.sigma
+        node, child, offset = state
+
+        while i < m:
+            if offset == 0:
+                # No edge starting with this character
+                child = children[node * sigma + pat[i]]
+                if child < 0:
+                    return None
+
+            s = start[child]
+            e = edge_end[child]
+            edge_len = (self.end if e < 0 else e) - s + 1
+
+            # Match the rest of the edge (or of the pattern) in one slice
+            # compare, a memcmp for bytes
+            k = edge_len - offset
+            if k > m - i:
+                k = m - i
+            s += offset
+            if text[s:s + k] != pat[i:i + k]:
+                return None
+            i += k
+            offset += k
+
             # Move to child node if we consumed entire edge
-            if j == edge_len:
-                node = child
-        
-        return True
+            if offset == edge_len:
+                node, offset = child, 0
+
+        return node, child, offset
+
+
+def _suffix_array(codes):
+    """
+    Suffix array of codes by prefix doubling.
+
+    Suffixes are first sorted on their first 16 codes (slices compare
+    in C). Each round then sorts on (rank of the first k codes, rank of
+    the next k), packed into one int per suffix, until all ranks are
+    distinct. O(n log^2 n) in the worst case, with few rounds unless
+    the text has long repeats.
+    """
+    n = len(codes)
+    k = 16
+    order = sorted(range(n), key=lambda i: codes[i:i + k])
+
+    rank = [0] * n
+    r = 0
+    prev = None
+    for i in order:
+        key = codes[i:i + k]
+        if key != prev:
+            r += 1
+            prev = key
+        rank[i] = r
+
+    while r < n:
+        keys = [rank[i] * (n + 1) + (rank[i + k] if i + k < n else 0) for i in range(n)]
+        order.sort(key=keys.__getitem__)
+        r = 0
+        prev = -1
+        for i in order:
+            key = keys[i]
+            if key != prev:
+                r += 1
+                prev = key
+            rank[i] = r
+        k *= 2
+
+    return order
+
+
+class SuffixArray:
+    """
+    Suffix array over the text codes: a compact alternative to SuffixTree
+    with the same has_substring interface.
+
+    Stores the codes and the sorted suffix starts as a 32-bit array,
+    about 5 bytes per character. Built with pydivsufsort when it is
+    installed, by prefix doubling otherwise.
+    """
+    def __init__(self, text):
+        # Only the codes are kept; text is rebuilt from them on demand
+        self.slot, self.table, self.codes = encode_alphabet(text)
+
+        if pydivsufsort is not None and isinstance(self.codes, bytes) and self.codes:
+            self.sa = array('i', pydivsufsort.divsufsort(self.codes).tolist())
+        else:
+            self.sa = array('i', _suffix_array(self.codes))
+
+    @property
+    def text(self) -> str:
+        """The indexed text, decoded from the codes."""
+        return _decode_text(self.slot, self.codes)
+
+    def has_substring(self, pattern: str) -> bool:
+        """
+        Search for a pattern by binary search over the suffix array.
+
+        Parameters
+        ----------
+        pattern : str
+            The pattern to search for.
+
+        Returns
+        -------
+        bool
+            True if pattern exists in the text, False otherwise.
+
+        Complexity: O(m log n) where m is pattern length
+        """
+        if not pattern:
+            return True
+
+        pat = _encode_pattern(pattern, self.slot, self.table)
+        if pat is None:
+            return False
+
+        text, sa = self.codes, self.sa
+        m = len(pat)
+
+        # first suffix whose m-prefix is >= pat
+        lo, hi = 0, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = sa[mid]
+            if text[i:i + m] < pat:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo == len(sa):
+            return False
+        i = sa[lo]
+        return text[i:i + m] == pat
+
+
+def build_many(texts, nproc=None) -> list:
+    """
+    Build one SuffixTree per text over nproc processes.
+
+    The trees are independent, so construction runs in parallel
+    without the GIL. A tree is plain int arrays, which pickle back
+    in a fraction of its build time.
+
+    Parameters
+    ----------
+    texts : list of str
+        The texts to index.
+    nproc : int, optional
+        Number of worker processes (default: os.cpu_count()).
+
+    Returns
+    -------
+    list
+        SuffixTree for each text, in order.
+    """
+    texts = list(texts)
+    if nproc is None:
+        nproc = os.cpu_count() or 1
+
+    if nproc <= 1 or len(texts) <= 1:
+        return [SuffixTree(text) for text in texts]
+
+    with ProcessPoolExecutor(max_workers=min(nproc, len(texts))) as executor:
+        return list(executor.map(SuffixTree, texts))
 
 
 if __name__ == '__main__':